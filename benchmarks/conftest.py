@@ -0,0 +1,72 @@
+from typing import Any, Dict, Tuple
+
+import pandas as pd
+import pytest
+import spacy
+
+from src.fixtures.corpus import make_corpus
+from src.transform.nlp_operator import SPACY_MODEL
+
+
+# corpora generated once per session, keyed by their arguments
+_CORPORA: Dict[Tuple, pd.DataFrame] = {}
+
+requires_spacy_model = pytest.mark.skipif(
+    not spacy.util.is_package(SPACY_MODEL), reason=f"the spaCy model {SPACY_MODEL} is not installed"
+)
+
+
+def pytest_addoption(parser: Any) -> None:
+    parser.addoption(
+        "--corpus-size",
+        action="append",
+        type=int,
+        help="number of rows of the synthetic corpus, can be repeated (e.g. 1000, 100000, 1000000), "
+        "defaults to 1000",
+    )
+
+
+def pytest_generate_tests(metafunc: Any) -> None:
+    if "n_rows" in metafunc.fixturenames:
+        metafunc.parametrize("n_rows", metafunc.config.getoption("corpus_size") or [1000], scope="session")
+
+
+def get_corpus(n_rows: int, **kwargs: Any) -> pd.DataFrame:
+    """
+    > Generate the synthetic corpus once per session, see make_corpus
+
+    :param n_rows: The number of rows
+    :type n_rows: int
+    :return: The corpus, which must not be modified
+    """
+    key = (n_rows, tuple(sorted(kwargs.items())))
+    if key not in _CORPORA:
+        _CORPORA[key] = make_corpus(n_rows, **kwargs)
+
+    return _CORPORA[key]
+
+
+@pytest.fixture
+def corpus(n_rows: int) -> pd.DataFrame:
+    """A corpus of reviews with 30% of duplicated texts and a few emojis and emoticons."""
+    return get_corpus(n_rows, duplicate_ratio=0.3, emoji_density=0.02)
+
+
+def run_transform(benchmark: Any, operator: Any, df: pd.DataFrame, rounds: int = 3) -> pd.DataFrame:
+    """
+    > Benchmark the transform of a fitted operator. Every round runs on a fresh copy of the dataframe,
+    since the operators modify their input, and the copy is not timed
+
+    :param benchmark: The pytest-benchmark fixture
+    :type benchmark: Any
+    :param operator: The operator
+    :type operator: Any
+    :param df: The input dataframe
+    :type df: pd.DataFrame
+    :param rounds: The number of timed runs, defaults to 3
+    :type rounds: int (optional)
+    :return: The output of the last run
+    """
+    operator.fit(df.copy())
+
+    return benchmark.pedantic(operator.transform, setup=lambda: ((df.copy(),), {}), rounds=rounds)
@@ -0,0 +1,62 @@
+import pytest
+
+from benchmarks.conftest import get_corpus, requires_spacy_model, run_transform
+from src.transform.nlp_operator import *
+
+
+@pytest.mark.parametrize(
+    "operator",
+    [
+        NlpWordExpansion(text_column="text"),
+        NlpWordExpansion(text_column="text", fast=True),
+        NlpReplaceEmojis(text_column="text"),
+        NlpReplaceEmoticons(text_column="text"),
+        NlpReplaceEmotes(text_column="text"),
+        NlpDeDuplicatesSpace(text_column="text"),
+        NlpReplaceWordRepetition(text_column="text"),
+        NlpRemoveCharRepetition(text_column="text"),
+        NlpTextNormalizer(text_column="text"),
+        NlpTextNormalizer(text_column="text", vectorized=True),
+        NlpFusedText(
+            text_column="text",
+            operators=[NlpDeDuplicatesSpace("text"), NlpReplaceWordRepetition("text"), NlpRemoveCharRepetition("text")],
+        ),
+    ],
+    ids=lambda operator: f"{type(operator).__name__}{'-fast' if getattr(operator, 'fast', False) else ''}",
+)
+def test_text_operator(benchmark, corpus, operator):
+    benchmark.group = type(operator).__name__
+    run_transform(benchmark, operator, corpus)
+
+
+@pytest.mark.parametrize("duplicate_ratio", [0.0, 0.5, 0.9])
+def test_detect_language(benchmark, n_rows, duplicate_ratio):
+    benchmark.group = f"NlpDetectLanguage duplicates={duplicate_ratio}"
+    corpus = get_corpus(n_rows, duplicate_ratio=duplicate_ratio)
+    run_transform(benchmark, NlpDetectLanguage(text_column="text", new_column="lang", max_length=200), corpus, rounds=1)
+
+
+@pytest.mark.parametrize("emoji_density", [0.0, 0.05])
+def test_replace_emotes(benchmark, n_rows, emoji_density):
+    benchmark.group = f"emojis density={emoji_density}"
+    corpus = get_corpus(n_rows, emoji_density=emoji_density)
+    run_transform(benchmark, NlpReplaceEmotes(text_column="text", new_column="clean"), corpus)
+
+
+@requires_spacy_model
+@pytest.mark.parametrize(
+    "operator",
+    [
+        NlpRemoveStopwords(text_column="text", new_column="output"),
+        NlpTextToSentences(text_column="text", new_column="output"),
+        NlpTextToWords(text_column="text", new_column="output"),
+        NlpWordLemmatizer(text_column="text", new_column="output"),
+        NlpSpeechTagging(text_column="text", new_column="output"),
+        NlpSpeechTagging(text_column="text", new_column="output", output="columns"),
+        NlpDeduplicated(NlpWordLemmatizer(text_column="text", new_column="output")),
+    ],
+    ids=lambda operator: type(operator).__name__,
+)
+def test_spacy_operator(benchmark, corpus, operator):
+    benchmark.group = type(operator).__name__
+    run_transform(benchmark, operator, corpus, rounds=1)
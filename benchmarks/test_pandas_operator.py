@@ -0,0 +1,47 @@
+import pytest
+
+from benchmarks.conftest import run_transform
+from src.transform.pandas_operator import *
+
+
+@pytest.mark.parametrize(
+    "operator",
+    [
+        DataFrameColumnsSelection(columns=["text", "polarity"]),
+        DataFrameColumnsDrop(columns=["useless"]),
+        DataFrameColumnsRename(columns_mapping={"text": "review"}),
+        DataFrameDropEmptyRows(text_column="text"),
+        DataFrameValueFrequency(text_column="type", new_column="frequency"),
+        DataFrameQueryFilter(text_column="polarity", query="== 1"),
+        DataFrameInplodeColumn(key_column="type", agg_column="text"),
+    ],
+    ids=lambda operator: type(operator).__name__,
+)
+def test_frame_operator(benchmark, corpus, operator):
+    benchmark.group = type(operator).__name__
+    run_transform(benchmark, operator, corpus)
+
+
+@pytest.mark.parametrize("engine", ["pandas", "pyarrow"])
+@pytest.mark.parametrize(
+    "operator_class", [DataFrameTextLength, DataFrameTextNumberWords, DataFrameTextFormat], ids=lambda cls: cls.__name__
+)
+def test_text_operator(benchmark, corpus, operator_class, engine):
+    benchmark.group = operator_class.__name__
+    run_transform(benchmark, operator_class(text_column="text", new_column="output", engine=engine), corpus)
+
+
+def test_explode_column(benchmark, corpus):
+    benchmark.group = "DataFrameExplodeColumn"
+    words = corpus.assign(words=corpus["text"].str.split())
+    run_transform(benchmark, DataFrameExplodeColumn(text_column="words"), words)
+
+
+@pytest.mark.parametrize("extension", [".csv", ".parquet"])
+def test_write_read(benchmark, corpus, tmp_path, extension):
+    benchmark.group = f"read {extension}"
+    path = str(tmp_path / f"corpus{extension}")
+    writer = DataFrameToCsv(path) if extension == ".csv" else DataFrameToParquet(path)
+    writer.transform(corpus)
+    reader = DataFrameReadCsv(path) if extension == ".csv" else DataFrameReadParquet(path)
+    benchmark.pedantic(reader.transform, args=(None,), rounds=3)
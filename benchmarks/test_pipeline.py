@@ -0,0 +1,45 @@
+import pytest
+
+from src.transform.pipeline import *
+
+
+def make_pipeline() -> Pipeline:
+    return Pipeline(
+        [
+            ("DataFrameColumnsSelection", DataFrameColumnsSelection(columns=["text", "polarity"])),
+            ("NlpReplaceEmotes", NlpReplaceEmotes("text", "clean")),
+            ("NlpWordExpansion", NlpWordExpansion("clean", fast=True)),
+            ("NlpTextNormalizer", NlpTextNormalizer("clean")),
+            ("DataFrameTextLength", DataFrameTextLength("clean", "text_length")),
+            ("DataFrameTextNumberWords", DataFrameTextNumberWords("clean", "number_words")),
+            ("DataFrameQueryFilter", DataFrameQueryFilter("number_words", query=">5")),
+        ]
+    )
+
+
+@pytest.mark.parametrize("chunks", [1, 10])
+@pytest.mark.parametrize("njobs", [1, 2, 4])
+def test_pipeline_transform(benchmark, corpus, njobs, chunks):
+    benchmark.group = f"PipelineTransform chunks={chunks}"
+    chunksize = max(1, len(corpus) // chunks)
+
+    def run():
+        with PipelineTransform(make_pipeline(), njobs=njobs, fit_once=True) as transform:
+            return transform.transform(corpus, chunksize)
+
+    benchmark.pedantic(run, rounds=3)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"shared_memory": True}, {"task_size": 500}, {"task_size": 500, "balance_column": "text"}],
+    ids=["default", "shared_memory", "task_size", "balanced"],
+)
+def test_pipeline_dispatch(benchmark, corpus, options):
+    benchmark.group = "PipelineTransform dispatch"
+
+    def run():
+        with PipelineTransform(make_pipeline(), njobs=4, fit_once=True, **options) as transform:
+            return transform.transform(corpus, max(1, len(corpus) // 4))
+
+    benchmark.pedantic(run, rounds=3)
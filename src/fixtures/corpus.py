@@ -0,0 +1,82 @@
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+
+WORDS = (
+    "the movie film good bad great plot actor actress scene story director watch one time really "
+    "character make even see well much first think another might kid family fan work king love hate "
+    "boring funny long short end music script cast performance drama comedy thriller horror"
+).split()
+CONTRACTIONS = ("it's", "don't", "can't", "i'm", "they're", "wasn't", "you'll", "we'd")
+EMOJIS = ("\U0001f642", "\U0001f600", "\u2764", "\U0001f44d", "\U0001f62d", "\U0001f525")
+EMOTICONS = (":)", ":-(", ":D", ";)")
+GENRES = ("drama", "comedy", "thriller")
+
+
+def _sample(rng: np.random.Generator, values: Sequence[str], size: int) -> np.ndarray:
+    return np.asarray(values, dtype=object)[rng.integers(len(values), size=size)]
+
+
+def make_corpus(
+    n_rows: int,
+    mean_words: float = 20,
+    sigma: float = 0.8,
+    duplicate_ratio: float = 0.0,
+    emoji_density: float = 0.0,
+    contraction_density: float = 0.05,
+    seed: int = 0,
+    words: Sequence[str] = WORDS,
+) -> pd.DataFrame:
+    """
+    > Generate a synthetic corpus of reviews with the columns of FIXTURE_DF. The same arguments always
+    give the same corpus, so benchmarks run on identical data
+
+    :param n_rows: The number of rows
+    :type n_rows: int
+    :param mean_words: The mean number of words of a text, defaults to 20
+    :type mean_words: float (optional)
+    :param sigma: The spread of the log-normal distribution of the number of words, 0 gives texts of
+    the same length, defaults to 0.8
+    :type sigma: float (optional)
+    :param duplicate_ratio: The share of rows whose text is a copy of another row, defaults to 0
+    :type duplicate_ratio: float (optional)
+    :param emoji_density: The probability of a word to be followed by an emoji or an emoticon,
+    defaults to 0
+    :type emoji_density: float (optional)
+    :param contraction_density: The probability of a word to be a contraction, defaults to 0.05
+    :type contraction_density: float (optional)
+    :param seed: The seed of the random generator, defaults to 0
+    :type seed: int (optional)
+    :param words: The vocabulary of the texts
+    :type words: Sequence[str] (optional)
+    :return: A dataframe with the id, type, useless, text and polarity columns
+    """
+    rng = np.random.default_rng(seed)
+    mu = np.log(mean_words) - sigma**2 / 2
+    lengths = np.maximum(1, rng.lognormal(mu, sigma, n_rows).round().astype(int))
+    n_words = lengths.sum()
+    tokens = _sample(rng, words, n_words)
+    contraction = rng.random(n_words) < contraction_density
+    tokens[contraction] = _sample(rng, CONTRACTIONS, contraction.sum())
+    emote = rng.random(n_words) < emoji_density
+    tokens[emote] = tokens[emote] + " " + _sample(rng, EMOJIS + EMOTICONS, emote.sum())
+
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    texts = np.array([" ".join(tokens[start:stop]) for start, stop in zip(bounds[:-1], bounds[1:])], dtype=object)
+    duplicates = rng.random(n_rows) < duplicate_ratio
+    duplicates[0] = False
+    if duplicates.any():
+        originals = np.flatnonzero(~duplicates)
+        texts[duplicates] = texts[rng.choice(originals, size=duplicates.sum())]
+
+    return pd.DataFrame(
+        {
+            "id": np.arange(1, n_rows + 1),
+            "type": _sample(rng, GENRES, n_rows),
+            "useless": np.zeros(n_rows, dtype=int),
+            "text": texts,
+            "polarity": rng.integers(2, size=n_rows),
+        }
+    )
@@ -0,0 +1,322 @@
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+import types
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+import spacy
+
+try:
+    from importlib import metadata
+except ImportError:  # Python 3.7
+    import importlib_metadata as metadata
+
+from sklearn.base import BaseEstimator
+from sklearn.pipeline import Pipeline
+
+from src.settings import INTERIM_DATA, LOGGER
+from src.transform.nlp_operator import SPACY_MODEL, NlpSpacyOperator
+from src.utils.profiler import PipelineProfiler
+
+
+CACHE_PATH = os.path.join(INTERIM_DATA, "step_cache")
+CACHE_EXTENSION = ".pkl"
+
+# libraries whose version can change the output of a step
+LIBRARIES = ("pandas", "numpy", "scikit-learn", "pyarrow", "spacy", "langdetect", "emot", "contractions")
+# the default repr of an object holds its address, which changes with every process
+MEMORY_ADDRESS = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+def library_versions() -> Dict[str, Optional[str]]:
+    """
+    > Find the installed version of the libraries used by the operators
+
+    :return: A dict of library name to version, None when the library is not installed
+    """
+    versions = {}
+    for library in LIBRARIES:
+        try:
+            versions[library] = metadata.version(library)
+        except metadata.PackageNotFoundError:
+            versions[library] = None
+
+    return versions
+
+
+def hash_frame(df: pd.DataFrame) -> str:
+    """
+    > Hash the content of a dataframe: its values, index, column names and dtypes. Columns holding
+    unhashable objects (lists, dicts) are hashed from the pickled list of their values
+
+    :param df: The dataframe
+    :type df: pd.DataFrame
+    :return: The hex digest
+    """
+    digest = hashlib.sha256()
+    digest.update(repr([(str(column), str(dtype)) for column, dtype in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df.index).to_numpy().tobytes())
+    for _, column in df.items():
+        try:
+            digest.update(pd.util.hash_pandas_object(column, index=False).to_numpy().tobytes())
+        except TypeError:
+            digest.update(pickle.dumps(column.tolist(), protocol=pickle.HIGHEST_PROTOCOL))
+
+    return digest.hexdigest()
+
+
+def stable_repr(value: Any) -> str:
+    """
+    > Describe a parameter of a step with a text that is the same in every process. Estimators are
+    described by their class and parameters, and functions and classes by their qualified name
+
+    :param value: The parameter
+    :type value: Any
+    :return: The description
+    :raise ValueError: The parameter has no stable description, e.g. a lambda, a local function or an
+    object whose repr holds its address
+    """
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}({', '.join(stable_repr(item) for item in value)})"
+    if isinstance(value, (set, frozenset)):
+        return f"{type(value).__name__}({sorted(stable_repr(item) for item in value)})"
+    if isinstance(value, dict):
+        return f"dict({sorted((stable_repr(key), stable_repr(item)) for key, item in value.items())})"
+    if isinstance(value, BaseEstimator):
+        params = stable_repr(sorted(value.get_params(deep=False).items()))
+        return f"{type(value).__module__}.{type(value).__qualname__}{params}"
+    if isinstance(value, (types.FunctionType, types.BuiltinFunctionType, type)):
+        if "<" in value.__qualname__:
+            raise ValueError(f"{value.__qualname__} has no stable name, define it at module level")
+        return f"{value.__module__}.{value.__qualname__}"
+    description = repr(value)
+    if MEMORY_ADDRESS.search(description):
+        raise ValueError(f"{description} has no stable repr")
+
+    return description
+
+
+def spacy_steps(step: Any) -> List[NlpSpacyOperator]:
+    """
+    > Find the spaCy operators run by a step: the step itself, or the operators it wraps, e.g. in a
+    NlpDeduplicated or a NlpFusedText
+
+    :param step: The pipeline step
+    :type step: Any
+    :return: The spaCy operators, in the order of the parameters
+    """
+    if isinstance(step, NlpSpacyOperator):
+        return [step]
+    if not isinstance(step, BaseEstimator):
+        return []
+    operators = []
+    for value in step.get_params(deep=False).values():
+        for item in value if isinstance(value, (list, tuple)) else [value]:
+            operators.extend(spacy_steps(item))
+
+    return operators
+
+
+def uses_spacy(step: Any) -> bool:
+    """
+    > Check if a step runs a spaCy model, itself or through the operators it wraps
+
+    :param step: The pipeline step
+    :type step: Any
+    :return: True if the output of the step depends on the spaCy model
+    """
+    return bool(spacy_steps(step))
+
+
+def step_key(step: Any, input_key: Optional[str], versions: Dict[str, Optional[str]]) -> Optional[str]:
+    """
+    > Compute the key of the output of a step, from the key of its input, the class and parameters of
+    the step and the versions of the libraries and spaCy model. Keys are chained, so changing a step
+    changes the keys of every step after it
+
+    :param step: The pipeline step
+    :type step: Any
+    :param input_key: The key of the input of the step, None if it has no key
+    :type input_key: str
+    :param versions: The library versions, see library_versions
+    :type versions: Dict[str, Optional[str]]
+    :return: The hex digest, None if the input has no key or a parameter of the step has no stable
+    description (see stable_repr), since such a key would change with every process
+    """
+    if input_key is None:
+        return None
+    params = step.get_params(deep=True) if hasattr(step, "get_params") else {}
+    try:
+        description = [input_key, type(step).__module__, type(step).__qualname__, stable_repr(sorted(params.items()))]
+    except ValueError as error:
+        LOGGER.warning(f"the output of {type(step).__name__} cannot be keyed: {error}")
+        return None
+    description.append(versions)
+    if uses_spacy(step):
+        description.append((SPACY_MODEL, spacy.util.get_package_version(SPACY_MODEL)))
+
+    return hashlib.sha256(repr(description).encode()).hexdigest()
+
+
+class StepCache:
+    """It stores the output of every pipeline step on disk, keyed by the content of its input and the step."""
+
+    def __init__(self, path: str = CACHE_PATH, max_bytes: int = 10 * 1024**3) -> None:
+        """
+        > The cache is a directory of pickled dataframes, one per step output. When the files take more
+        than max_bytes, the least recently used ones are removed
+
+        :param path: The directory of the cache, defaults to data/interim/step_cache
+        :type path: str (optional)
+        :param max_bytes: The maximum size of the cache on disk, defaults to 10GB
+        :type max_bytes: int (optional)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        # total size of the cache files, scanned on the first write and kept up to date by put and evict
+        self.size: Optional[int] = None
+
+    def file(self, key: str) -> str:
+        return os.path.join(self.path, key + CACHE_EXTENSION)
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        > Load the dataframe stored under the key, and mark it as recently used
+
+        :param key: The key of the step output
+        :type key: str
+        :return: The dataframe, None if it is not in the cache
+        """
+        file = self.file(key)
+        try:
+            with open(file, "rb") as f:
+                df = pickle.load(f)
+            os.utime(file)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+        return df
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        """
+        > Store the dataframe under the key. The file is written next to its final path and renamed, so
+        a crash or a concurrent reader never sees a partial file. The cache directory is only scanned
+        when the running total of the file sizes passes max_bytes; the files written by other processes
+        are counted at the next scan
+
+        :param key: The key of the step output
+        :type key: str
+        :param df: The dataframe
+        :type df: pd.DataFrame
+        """
+        os.makedirs(self.path, exist_ok=True)
+        if self.size is None:
+            self.size = sum(entry_size for _, entry_size, _ in self.entries())
+        file = self.file(key)
+        previous_size = os.path.getsize(file) if os.path.exists(file) else 0
+        fd, tmp_file = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+                size = f.tell()
+            os.replace(tmp_file, file)
+        except BaseException:
+            os.remove(tmp_file)
+            raise
+        self.size += size - previous_size
+        if self.size > self.max_bytes:
+            self.evict()
+
+    def entries(self) -> List[Tuple[float, int, str]]:
+        """
+        > List the files of the cache
+
+        :return: The modification time, size and path of every file
+        """
+        entries = []
+        for entry in os.scandir(self.path):
+            if entry.name.endswith(CACHE_EXTENSION):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        return entries
+
+    def evict(self) -> None:
+        """
+        > Remove the least recently used files until the cache fits in max_bytes
+        """
+        entries = self.entries()
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, entry_path in sorted(entries):
+            if size <= self.max_bytes:
+                break
+            try:
+                os.remove(entry_path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+        self.size = size
+
+    def keys(self, pipeline: Pipeline, df: pd.DataFrame) -> List[Optional[str]]:
+        """
+        > Compute the keys of the outputs of the pipeline steps for the input dataframe
+
+        :param pipeline: The pipeline
+        :type pipeline: Pipeline
+        :param df: The input dataframe
+        :type df: pd.DataFrame
+        :return: One key per step, None from the first step that cannot be keyed on
+        """
+        versions = library_versions()
+        keys = []
+        key = hash_frame(df)
+        for _, step in pipeline.steps:
+            key = step_key(step, key, versions)
+            keys.append(key)
+
+        return keys
+
+    def process(
+        self, pipeline: Pipeline, df: pd.DataFrame, fit: bool = True, profiler: Optional[PipelineProfiler] = None
+    ) -> pd.DataFrame:
+        """
+        > Run the pipeline on the dataframe, starting from the output of the last step found in the
+        cache, and store the output of every step that is run
+
+        :param pipeline: The pipeline
+        :type pipeline: Pipeline
+        :param df: The input dataframe
+        :type df: pd.DataFrame
+        :param fit: fit each step before transforming, like `fit_transform`, defaults to True
+        :type fit: bool (optional)
+        :param profiler: record the steps that are run, the steps loaded from the cache are not recorded
+        :type profiler: PipelineProfiler (optional)
+        :return: The output of the pipeline
+        """
+        keys = self.keys(pipeline, df)
+        start = 0
+        for index in reversed(range(len(keys))):
+            cached = None if keys[index] is None else self.get(keys[index])
+            if cached is not None:
+                LOGGER.info(f"step {pipeline.steps[index][0]} loaded from the cache")
+                start, df = index + 1, cached
+                break
+        for (name, step), key in zip(pipeline.steps[start:], keys[start:]):
+            if step is None or step == "passthrough":
+                continue
+            if profiler is not None:
+                df = profiler.run_step(name, step, df, fit)
+            else:
+                if fit:
+                    step.fit(df)
+                df = step.transform(df)
+            if key is not None:
+                self.put(key, df)
+
+        return df
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from typing import Any, Dict, Optional, Union
+
+import pandas as pd
+
+from sklearn.pipeline import Pipeline
+
+from src.settings import INTERIM_DATA, LOGGER
+from src.transform.cache import hash_frame, library_versions, step_key
+
+
+CHECKPOINT_PATH = os.path.join(INTERIM_DATA, "checkpoint")
+MANIFEST = "manifest.json"
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """
+    > Write the file next to its final path and rename it, so a crash never leaves a partial file
+
+    :param path: The path of the file
+    :type path: str
+    :param data: The content of the file
+    :type data: bytes
+    """
+    fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_file, path)
+    except BaseException:
+        os.remove(tmp_file)
+        raise
+
+
+def run_fingerprint(pipeline: Pipeline, input: Union[str, pd.DataFrame], chunksize: Optional[int]) -> Optional[str]:
+    """
+    > Identify a run from its input, its chunk size and its pipeline, so the checkpoints of another run
+    are never reused. A file is identified by its path, size and modification time. A pipeline with a
+    step that cannot be keyed (see step_key) has no fingerprint
+
+    :param pipeline: The pipeline
+    :type pipeline: Pipeline
+    :param input: The input file or dataframe
+    :type input: Union[str, pd.DataFrame]
+    :param chunksize: The number of rows per chunk
+    :type chunksize: int
+    :return: The hex digest, None if the run cannot be identified
+    """
+    if isinstance(input, str):
+        stat = os.stat(input)
+        key = repr((os.path.abspath(input), stat.st_size, stat.st_mtime_ns, chunksize))
+    else:
+        key = repr((hash_frame(input), chunksize))
+    versions = library_versions()
+    for _, step in pipeline.steps:
+        key = step_key(step, key, versions)
+
+    return None if key is None else hashlib.sha256(key.encode()).hexdigest()
+
+
+def chunk_offsets(df: pd.DataFrame) -> Optional[list]:
+    """
+    > The first and last input offsets of a chunk, which identify it in the manifest
+
+    :param df: The input chunk
+    :type df: pd.DataFrame
+    :return: [first, last], None for an empty chunk
+    """
+    if len(df) == 0:
+        return None
+    if pd.api.types.is_integer_dtype(df.index):
+        return [int(df.index[0]), int(df.index[-1])]
+
+    return [str(df.index[0]), str(df.index[-1])]
+
+
+class ChunkCheckpoint:
+    """It persists every transformed chunk of a run, so a restarted run skips the chunks already done."""
+
+    def __init__(self, path: str = CHECKPOINT_PATH) -> None:
+        """
+        > The checkpoint is a directory holding one pickle per transformed chunk and a manifest recording
+        the input offsets of the chunks that are done. Delete the directory to start from scratch
+
+        :param path: The directory of the checkpoint, defaults to data/interim/checkpoint
+        :type path: str (optional)
+        """
+        self.path = path
+        self.manifest: Dict[str, Any] = {}
+
+    def start(self, fingerprint: Optional[str]) -> None:
+        """
+        > Load the manifest of the run. The chunks of a previous run with another fingerprint are
+        discarded. A run without fingerprint is neither resumed nor checkpointed
+
+        :param fingerprint: The fingerprint of the run, see run_fingerprint
+        :type fingerprint: str
+        """
+        if fingerprint is None:
+            LOGGER.warning("the run cannot be fingerprinted, its chunks are not checkpointed")
+            self.manifest = {"fingerprint": None, "chunks": {}}
+            return
+        os.makedirs(self.path, exist_ok=True)
+        manifest_file = os.path.join(self.path, MANIFEST)
+        manifest = None
+        if os.path.exists(manifest_file):
+            with open(manifest_file) as f:
+                manifest = json.load(f)
+        if manifest is None or manifest["fingerprint"] != fingerprint:
+            if manifest is not None:
+                LOGGER.info(f"the checkpoint in {self.path} belongs to another run, starting from scratch")
+            manifest = {"fingerprint": fingerprint, "chunks": {}}
+        elif manifest["chunks"]:
+            LOGGER.info(f"resuming from {len(manifest['chunks'])} chunks done in {self.path}")
+        self.manifest = manifest
+
+    def load(self, index: int, offsets: Optional[list]) -> Optional[pd.DataFrame]:
+        """
+        > Load the transformed chunk if it is done
+
+        :param index: The position of the chunk in the run
+        :type index: int
+        :param offsets: The offsets of the input chunk, which must match the ones in the manifest
+        :type offsets: list
+        :return: The transformed chunk, None if it has to be processed
+        """
+        entry = self.manifest["chunks"].get(str(index))
+        if entry is None or entry["offsets"] != offsets:
+            return None
+        try:
+            with open(os.path.join(self.path, entry["file"]), "rb") as f:
+                return pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def save(self, index: int, offsets: Optional[list], transformed_df: pd.DataFrame) -> None:
+        """
+        > Persist the transformed chunk, then record it as done in the manifest
+
+        :param index: The position of the chunk in the run
+        :type index: int
+        :param offsets: The offsets of the input chunk, see chunk_offsets
+        :type offsets: list
+        :param transformed_df: The transformed chunk
+        :type transformed_df: pd.DataFrame
+        """
+        if self.manifest["fingerprint"] is None:
+            return
+        file = f"chunk-{index:06d}.pkl"
+        _atomic_write(os.path.join(self.path, file), pickle.dumps(transformed_df, protocol=pickle.HIGHEST_PROTOCOL))
+        self.manifest["chunks"][str(index)] = {
+            "offsets": offsets,
+            "rows": len(transformed_df),
+            "file": file,
+        }
+        _atomic_write(os.path.join(self.path, MANIFEST), json.dumps(self.manifest, indent=1).encode())
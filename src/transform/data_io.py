@@ -0,0 +1,245 @@
+import operator
+import os
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+
+CSV_EXTENSIONS = (".csv",)
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+ARROW_EXTENSIONS = (".arrow", ".feather", ".ipc")
+
+PANDAS_OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+ARROW_OPERATORS = {
+    "==": pc.equal,
+    "!=": pc.not_equal,
+    "<": pc.less,
+    "<=": pc.less_equal,
+    ">": pc.greater,
+    ">=": pc.greater_equal,
+}
+
+
+def file_format(path: str) -> str:
+    """
+    > Find the format of a file from its extension
+
+    :param path: The path of the file
+    :type path: str
+    :return: One of "csv", "parquet" or "arrow"
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in PARQUET_EXTENSIONS:
+        return "parquet"
+    if extension in ARROW_EXTENSIONS:
+        return "arrow"
+
+    return "csv"
+
+
+def read_data(
+    input_file: str,
+    chunksize: int = None,
+    columns: List[str] = None,
+    filters: List[Tuple[str, str, Any]] = None,
+) -> Iterable[pd.DataFrame]:
+    """
+    > Reads a CSV, Parquet or Arrow IPC file into a Pandas DataFrame, either as a single DataFrame or as
+    an iterator of DataFrames, depending on the value of the chunksize parameter. Parquet files are
+    streamed by batches of row groups and Arrow files are memory mapped, so only one chunk is
+    materialized at a time
+
+    :param input_file: The path to the file you want to read
+    :type input_file: str
+    :param chunksize: The number of rows to read in at a time. If None, then all rows are read.
+    :type chunksize: int
+    :param columns: The columns to read. Columns missing from the file are ignored. If None, all the
+    columns are read
+    :type columns: List[str]
+    :param filters: The rows to keep, as a conjunction of (column, operator, value) predicates, see
+    filter_frame. The rows keep their index, as if they were filtered after reading
+    :type filters: List[Tuple[str, str, Any]]
+    :return: An iterable of dataframes.
+    """
+    filters = filters or []
+    fmt = file_format(input_file)
+    if fmt == "parquet":
+        return _read_parquet(input_file, chunksize, columns, filters)
+    if fmt == "arrow":
+        return _read_arrow(input_file, chunksize, columns, filters)
+
+    usecols = None if columns is None else (lambda column: column in columns)
+    if chunksize is None:
+        return [filter_frame(pd.read_csv(input_file, encoding="latin1", usecols=usecols), filters)]
+    chunks_df = pd.read_csv(input_file, encoding="latin1", usecols=usecols, chunksize=chunksize)
+    if not filters:
+        return chunks_df
+
+    return (filter_frame(chunk_df, filters) for chunk_df in chunks_df)
+
+
+def filter_frame(df: pd.DataFrame, filters: List[Tuple[str, str, Any]]) -> pd.DataFrame:
+    """
+    > Keep the rows of the dataframe matching all the predicates. A predicate is a (column, operator,
+    value) tuple, where the operator is a comparison like "==" or ">", or "notnull" without value
+
+    :param df: The dataframe
+    :type df: pd.DataFrame
+    :param filters: The predicates
+    :type filters: List[Tuple[str, str, Any]]
+    :return: The filtered dataframe
+    """
+    if not filters:
+        return df
+    mask = np.ones(len(df), dtype=bool)
+    for column, op, value in filters:
+        if op == "notnull":
+            mask &= df[column].notnull().to_numpy()
+        else:
+            mask &= PANDAS_OPERATORS[op](df[column], value).to_numpy(dtype=bool)
+
+    return df[mask]
+
+
+def _filter_table(table: pa.Table, filters: List[Tuple[str, str, Any]], offset: int) -> pd.DataFrame:
+    """
+    > Filter an Arrow table with the predicates before converting it, so the dropped rows are never
+    converted to Python objects. The dataframe is indexed by the row offsets in the file
+
+    :param table: The Arrow table or record batch
+    :type table: pa.Table
+    :param filters: The predicates, see filter_frame
+    :type filters: List[Tuple[str, str, Any]]
+    :param offset: The row offset of the table in the file
+    :type offset: int
+    :return: The filtered dataframe
+    """
+    if not filters:
+        return _with_offset(table.to_pandas(), offset)
+    mask = None
+    for column, op, value in filters:
+        if op == "notnull":
+            column_mask = pc.is_valid(table[column])
+        else:
+            column_mask = pc.fill_null(ARROW_OPERATORS[op](table[column], value), op == "!=")
+        mask = column_mask if mask is None else pc.and_(mask, column_mask)
+    # the columns of a table are chunked arrays, whose to_numpy takes no argument in older pyarrow
+    if isinstance(mask, pa.ChunkedArray):
+        mask = mask.combine_chunks()
+    df = table.filter(mask).to_pandas()
+    df.index = offset + np.flatnonzero(mask.to_numpy(zero_copy_only=False))
+
+    return df
+
+
+def _project(names: List[str], columns: Optional[List[str]]) -> Optional[List[str]]:
+    """
+    > Keep the requested columns that exist in the file, in the order of the file
+
+    :param names: The columns of the file
+    :type names: List[str]
+    :param columns: The requested columns, None for all of them
+    :type columns: List[str]
+    :return: The columns to read
+    """
+    if columns is None:
+        return None
+
+    return [name for name in names if name in columns]
+
+
+def _with_offset(df: pd.DataFrame, offset: int) -> pd.DataFrame:
+    """
+    > Give the chunk a range index starting at its row offset in the file, like the CSV reader does
+
+    :param df: The chunk
+    :type df: pd.DataFrame
+    :param offset: The row offset of the chunk in the file
+    :type offset: int
+    :return: The chunk
+    """
+    df.index = pd.RangeIndex(offset, offset + len(df))
+
+    return df
+
+
+def _read_parquet(input_file: str, chunksize: int, columns: List[str], filters: List[Tuple]) -> Iterable[pd.DataFrame]:
+    parquet_file = pq.ParquetFile(input_file)
+    columns = _project(parquet_file.schema_arrow.names, columns)
+    if chunksize is None:
+        return [_filter_table(parquet_file.read(columns=columns), filters, 0)]
+
+    return _iter_parquet(parquet_file, chunksize, columns, filters)
+
+
+def _iter_parquet(
+    parquet_file: pq.ParquetFile, chunksize: int, columns: List[str], filters: List[Tuple]
+) -> Iterator[pd.DataFrame]:
+    offset = 0
+    for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+        yield _filter_table(batch, filters, offset)
+        offset += batch.num_rows
+
+
+def _read_arrow(input_file: str, chunksize: int, columns: List[str], filters: List[Tuple]) -> Iterable[pd.DataFrame]:
+    table = pa.ipc.open_file(pa.memory_map(input_file, "r")).read_all()
+    columns = _project(table.schema.names, columns)
+    if columns is not None:
+        table = table.select(columns)
+    if chunksize is None:
+        return [_filter_table(table, filters, 0)]
+
+    return _iter_arrow(table, chunksize, filters)
+
+
+def _iter_arrow(table: pa.Table, chunksize: int, filters: List[Tuple]) -> Iterator[pd.DataFrame]:
+    for offset in range(0, table.num_rows, chunksize):
+        yield _filter_table(table.slice(offset, chunksize), filters, offset)
+
+
+def write_data(chunks_df: Iterable[pd.DataFrame], output_file: str) -> int:
+    """
+    > Writes the dataframes one after the other in a CSV, Parquet or Arrow IPC file. In a CSV file the
+    header is only written once, in a Parquet file every dataframe is a row group, and in an Arrow file
+    every dataframe is a record batch. The schema of the first dataframe is used for the whole file
+
+    :param chunks_df: The dataframes to write
+    :type chunks_df: Iterable[pd.DataFrame]
+    :param output_file: The path of the file to write
+    :type output_file: str
+    :return: The number of rows written
+    """
+    fmt = file_format(output_file)
+    n_rows = 0
+    writer = None
+    schema = None
+    try:
+        for index, chunk_df in enumerate(chunks_df):
+            if fmt == "csv":
+                chunk_df.to_csv(output_file, mode="w" if index == 0 else "a", header=index == 0, index=False)
+            else:
+                table = pa.Table.from_pandas(chunk_df, schema=schema, preserve_index=False)
+                if writer is None:
+                    schema = table.schema
+                    if fmt == "parquet":
+                        writer = pq.ParquetWriter(output_file, schema)
+                    else:
+                        writer = pa.ipc.new_file(output_file, schema)
+                writer.write_table(table)
+            n_rows += len(chunk_df)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return n_rows
@@ -1,20 +1,229 @@
 import re
-from typing import Any, Dict, List
+import multiprocessing as mp
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 import emot
+import emot.pattern_generator
 import spacy
 import contractions
 
-from langdetect import detect
+from emot import emo_unicode
+from langdetect import DetectorFactory, detect
 from sklearn.base import BaseEstimator
+from spacy.language import Language
+from spacy.tokens import Doc
 
+import numpy as np
 import pandas as pd
 
 
+SPACY_MODEL = "en_core_web_sm"
+
+MULTIPLE_SPACES = re.compile(" {2,}")
+WORD_REPETITION = re.compile(r"(\b\w+\W+)(\1{2,})")
+CHAR_REPETITION = re.compile(r"(\S)(\1{2,})")
+
+# attributes of the tokens returned by NlpSpeechTagging, and their types in its token table
+POS_ATTRIBUTES = {
+    "token": "text",
+    "lemma": "lemma_",
+    "pos": "pos_",
+    "tag": "tag_",
+    "dependency": "dep_",
+    "sentiment": "sentiment",
+    "shape": "shape_",
+    "is_alpha": "is_alpha",
+    "is_stopwords": "is_stop",
+}
+POS_DTYPES = {
+    "token": object,
+    "lemma": object,
+    "pos": "category",
+    "tag": "category",
+    "dependency": "category",
+    "sentiment": "float64",
+    "shape": "category",
+    "is_alpha": bool,
+    "is_stopwords": bool,
+}
+
+# compiled emoji and emoticon matchers, shared by every operator, see get_emote_matcher
+_EMOTE_MATCHERS: Dict[Tuple[bool, bool], Tuple[re.Pattern, Optional[re.Pattern], Dict[str, str]]] = {}
+
+# compiled contractions matcher of NlpWordExpansion, see get_contractions_matcher
+_CONTRACTIONS_MATCHER: Optional[Tuple[re.Pattern, Dict[str, str]]] = None
+APOSTROPHES = "['\u2019]"
+# the case of the expansion follows the case of the contraction, like in contractions.fix
+CONTRACTION_CASES = {
+    "upper": str.upper,
+    "lower": str.lower,
+    "title": str.title,
+    "sent": lambda text: text[:1].upper() + text[1:].lower(),
+}
+
+# spaCy models loaded in the process, shared by every operator, see get_spacy_model
+_SPACY_MODELS: Dict[Tuple[str, Optional[Tuple[str, ...]]], Language] = {}
+
+
+def load_spacy_model(model_name: str = SPACY_MODEL, components: Optional[Sequence[str]] = None) -> Language:
+    """
+    It loads a spaCy model with only the components that are needed. The other components are
+    excluded, so they are neither loaded in memory nor run, and the needed components that are disabled
+    by default (like `senter`) are enabled
+
+    :param model_name: The name of the installed spaCy model or the path to it, defaults to en_core_web_sm
+    :type model_name: str (optional)
+    :param components: The components to keep, the tokenizer is always kept. If None, the full default
+    pipeline is loaded
+    :type components: Sequence[str] (optional)
+    :return: A spaCy Language object
+    """
+    if components is None:
+        return spacy.load(model_name)
+
+    if Path(model_name).exists():
+        model_path = Path(model_name)
+    else:
+        model_path = spacy.util.get_package_path(model_name)
+    meta = spacy.util.get_model_meta(model_path)
+    available = meta.get("components", meta["pipeline"])
+    nlp = spacy.load(model_name, exclude=[name for name in available if name not in components])
+    for name in components:
+        if name in nlp.disabled:
+            nlp.enable_pipe(name)
+
+    return nlp
+
+
+def get_spacy_model(model_name: str = SPACY_MODEL, components: Optional[Sequence[str]] = None) -> Language:
+    """
+    It returns the spaCy model loaded with the given components, loading it on first use only. Every
+    operator asking for the same model and components in the process gets the same instance, and
+    models loaded before a fork are shared with the workers copy-on-write
+
+    :param model_name: The name of the installed spaCy model or the path to it, defaults to en_core_web_sm
+    :type model_name: str (optional)
+    :param components: The components to keep, see load_spacy_model
+    :type components: Sequence[str] (optional)
+    :return: A spaCy Language object
+    """
+    key = (model_name, None if components is None else tuple(sorted(components)))
+    if key not in _SPACY_MODELS:
+        _SPACY_MODELS[key] = load_spacy_model(model_name, components)
+
+    return _SPACY_MODELS[key]
+
+
+def _init_language_worker(seed: Optional[int]) -> None:
+    """
+    It seeds langdetect in a worker process, the seed is not inherited by spawned processes
+
+    :param seed: The seed of langdetect, None to keep it random
+    :type seed: int
+    """
+    DetectorFactory.seed = seed
+
+
+def get_emote_matcher(
+    emojis: bool = True, emoticons: bool = True
+) -> Tuple[re.Pattern, Optional[re.Pattern], Dict[str, str]]:
+    """
+    It compiles the emojis and emoticons known by emot in a single regex, built from a trie of the
+    symbols like emot does, so a text is scanned once whatever the size of the vocabulary. The regexes
+    are compiled on first use only and shared by every operator of the process
+
+    :param emojis: match the emojis, defaults to True
+    :type emojis: bool (optional)
+    :param emoticons: match the emoticons, defaults to True
+    :type emoticons: bool (optional)
+    :return: The regex, the regex for ASCII texts (None when nothing ASCII is matched) and the meanings
+    of the symbols
+    """
+    key = (emojis, emoticons)
+    if key not in _EMOTE_MATCHERS:
+        patterns = []
+        meanings = {}
+        ascii_pattern = None
+        if emojis:
+            trie = emot.pattern_generator.pattern_generator()
+            for symbol in list(emo_unicode.EMOJI_UNICODE.values()) + list(emo_unicode.EMOJI_ALIAS_UNICODE.values()):
+                trie.add(symbol)
+            patterns.append(trie.pattern())
+            meanings.update({symbol: name for name, symbol in emo_unicode.EMOJI_ALIAS_UNICODE.items()})
+            meanings.update(emo_unicode.UNICODE_EMOJI)
+        if emoticons:
+            trie = emot.pattern_generator.pattern_generator()
+            for symbol in emo_unicode.EMOTICONS_EMO:
+                trie.add(symbol)
+            patterns.append(trie.pattern())
+            meanings.update(emo_unicode.EMOTICONS_EMO)
+            ascii_trie = emot.pattern_generator.pattern_generator()
+            for symbol in emo_unicode.EMOTICONS_EMO:
+                if symbol.isascii():
+                    ascii_trie.add(symbol)
+            ascii_pattern = re.compile(ascii_trie.pattern())
+        pattern = re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+        _EMOTE_MATCHERS[key] = (pattern, ascii_pattern, meanings)
+
+    return _EMOTE_MATCHERS[key]
+
+
+def determine_case(word: str) -> str:
+    """
+    It finds the case of a word the way contractions.fix does, so the fast expansion gives the same case
+
+    :param word: The word
+    :type word: str
+    :return: One of the keys of CONTRACTION_CASES, or "mixed"
+    """
+    if word == word.upper():
+        return "upper"
+    if word == word.title():
+        return "title"
+    if word == word.lower():
+        return "lower"
+    if word == CONTRACTION_CASES["sent"](word):
+        return "sent"
+
+    return "mixed"
+
+
+def get_contractions_matcher() -> Tuple[re.Pattern, Dict[str, str]]:
+    """
+    It compiles the contractions with an apostrophe known by the contractions library in a single
+    case-insensitive regex, matching whole words only like `contractions.fix`, with the lowercase
+    contraction to expansion dict. The regex is compiled on first use only
+
+    :return: The regex and the expansions
+    """
+    global _CONTRACTIONS_MATCHER
+    if _CONTRACTIONS_MATCHER is None:
+        vocabulary = {**contractions.contractions_dict, **contractions.leftovers_dict, **contractions.slang_dict}
+        expansions = {key.lower(): value for key, value in vocabulary.items() if "'" in key or "\u2019" in key}
+        # longest first, so the longest contraction starting at a position wins
+        alternation = "|".join(re.escape(key) for key in sorted(expansions, key=len, reverse=True))
+        pattern = re.compile(f"(?<![A-Za-z0-9_])(?:{alternation})(?![A-Za-z0-9_])", re.IGNORECASE)
+        _CONTRACTIONS_MATCHER = (pattern, expansions)
+
+    return _CONTRACTIONS_MATCHER
+
+
 class NlpDetectLanguage(BaseEstimator):
     """It's a wrapper for the detect_language function from the langdetect library."""
 
-    def __init__(self, text_column: str, new_column: str = None) -> None:
+    def __init__(
+        self,
+        text_column: str,
+        new_column: str = None,
+        seed: Optional[int] = 0,
+        max_length: Optional[int] = None,
+        n_process: int = 1,
+        batch_size: int = 1000,
+        cache_size: int = 100_000,
+        detector: Optional[Callable[[str], str]] = None,
+    ) -> None:
         """
         The function takes in a text column and a new column name, and if the new column name is not
         specified, it will use the text column name as the new column name
@@ -24,47 +233,109 @@ class NlpDetectLanguage(BaseEstimator):
         :param new_column: The name of the new column that will be created. If not specified, the new
         column will have the same name as the text column
         :type new_column: str
+        :param seed: The seed of langdetect, so the same text gets the same language in every run. None
+        keeps langdetect random
+        :type seed: int (optional)
+        :param max_length: The number of characters of the text used to detect its language, the whole
+        text if None. The language of a long text is usually clear from its beginning
+        :type max_length: int (optional)
+        :param n_process: The number of processes used to detect the languages of a dataframe. Inside a
+        worker of a PipelineTransform pool, which cannot start processes, the languages are detected in
+        the worker itself
+        :type n_process: int
+        :param batch_size: The number of texts sent to a process at a time when n_process > 1
+        :type batch_size: int
+        :param cache_size: The maximum number of texts whose language is memoized, the cache is emptied
+        when it is full
+        :type cache_size: int
+        :param detector: The function returning the language of a text, defaults to langdetect.detect.
+        It must be picklable (defined at module level) when n_process > 1
+        :type detector: Callable[[str], str] (optional)
         """
         self.text_column = text_column
         if new_column is None:
             self.new_column = text_column
         else:
             self.new_column = new_column
+        self.seed = seed
+        self.max_length = max_length
+        self.n_process = n_process
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self.detector = detector
+        self.languages: Dict[str, str] = {}
 
     def fit(self, x: Any, y: Any = None) -> __qualname__:
+        self.languages = {}
+
         return self
 
     @staticmethod
-    def detect_language(message: str) -> str:
+    def detect_language(message: str, detector: Optional[Callable[[str], str]] = None) -> str:
         """
         It takes a string as input, removes all non-printable characters, and then uses the detect()
         function from the langdetect library to detect the language of the string
 
         :param message: str
         :type message: str
+        :param detector: The function returning the language of a text, defaults to langdetect.detect
+        :type detector: Callable[[str], str] (optional)
         :return: The language of the message.
         """
-        printable_message = "".join(x for x in message if x.isprintable())
-        detected_language = detect(printable_message)
+        if not message.isprintable():
+            message = "".join(x for x in message if x.isprintable())
+        detected_language = (detector or detect)(message)
 
         return detected_language
 
+    def detect_languages(self, texts: List[str]) -> List[str]:
+        """
+        It detects the language of each text, in a pool of n_process processes if n_process > 1 and
+        the current process is not itself a daemonic pool worker
+
+        :param texts: The texts
+        :type texts: List[str]
+        :return: The languages of the texts
+        """
+        detect_text = partial(self.detect_language, detector=self.detector)
+        if self.n_process <= 1 or len(texts) <= self.batch_size or mp.current_process().daemon:
+            return [detect_text(text) for text in texts]
+
+        with mp.Pool(self.n_process, initializer=_init_language_worker, initargs=(self.seed,)) as pool:
+            return pool.map(detect_text, texts, chunksize=self.batch_size)
+
     def transform(self, x: Any) -> pd.DataFrame:
         """
         The function takes a dataframe, and a column name, and returns a new dataframe with a new column
-        that contains the language of the text in the original column
+        that contains the language of the text in the original column. Each distinct text is detected
+        once, and texts already seen by the operator are not detected again
 
         :param x: Any - the dataframe that will be passed to the transform method
         :type x: Any
         :return: A dataframe with a new column called 'language'
         """
-        x[self.new_column] = x[self.text_column].map(self.detect_language)
+        texts = x[self.text_column]
+        if self.max_length is not None:
+            texts = texts.str.slice(0, self.max_length)
+        unknown = [text for text in texts.unique() if text not in self.languages]
+        if len(self.languages) + len(unknown) > self.cache_size:
+            self.languages = {}
+        # langdetect reads its seed from a global, it is restored once the texts are detected
+        seed, DetectorFactory.seed = DetectorFactory.seed, self.seed
+        try:
+            self.languages.update(zip(unknown, self.detect_languages(unknown)))
+        finally:
+            DetectorFactory.seed = seed
+        x[self.new_column] = texts.map(self.languages)
 
         return x
 
 
 class NlpWordExpansion(BaseEstimator):
-    def __init__(self, text_column: str, new_column: str = None) -> None:
+    # name of the method applied to each text, used to fuse consecutive text operators in one pass
+    text_method = "expand_contractions"
+
+    def __init__(self, text_column: str, new_column: str = None, fast: bool = False) -> None:
         """
         This function takes in a text column and a new column name and returns a None
 
@@ -73,33 +344,198 @@ class NlpWordExpansion(BaseEstimator):
         :param new_column: The name of the new column that will contain the cleaned text. If not
         specified, the name of the new column will be the same as the original text column
         :type new_column: str
+        :param fast: expand the contractions with a regex compiled once from the contractions vocabulary,
+        and leave the texts without apostrophe untouched. Only the contractions with an apostrophe are
+        expanded, so slang like "gonna" or abbreviations like "jan." are kept, defaults to False
+        :type fast: bool (optional)
         """
         self.text_column = text_column
         if new_column is None:
             self.new_column = text_column
         else:
             self.new_column = new_column
+        self.fast = fast
 
     def fit(self, x: Any, y: Any = None) -> __qualname__:
+        if self.fast:
+            get_contractions_matcher()
+
         return self
 
+    def expand_contractions(self, text: str) -> str:
+        """
+        It expands the contractions of the text, e.g. "it's" becomes "it is"
+
+        :param text: The text to be processed
+        :type text: str
+        :return: The expanded text
+        """
+        if not self.fast:
+            return contractions.fix(text)
+        if "'" not in text and "\u2019" not in text:
+            return text
+        pattern, expansions = get_contractions_matcher()
+
+        def expand(match: re.Match) -> str:
+            word = match.group()
+            return CONTRACTION_CASES.get(determine_case(word), lambda x: x)(expansions[word.lower()])
+
+        return pattern.sub(expand, text)
+
     def transform(self, x: Any) -> pd.DataFrame:
         """
-        Remove the word's contractions from a dataframe column
+        Remove the word's contractions from a dataframe column. In fast mode, only the texts holding an
+        apostrophe, found with a vectorized `str.contains`, are processed
 
         :param x: Any - the dataframe that you want to transform
         :type x: Any
         :return: A dataframe with the new column added.
         """
-        x[self.new_column] = x[self.text_column].apply(contractions.fix)
+        texts = x[self.text_column]
+        if self.fast:
+            mask = texts.str.contains(APOSTROPHES, regex=True, na=False)
+            texts = texts.copy()
+            texts[mask] = texts[mask].map(self.expand_contractions)
+            x[self.new_column] = texts
+        else:
+            x[self.new_column] = texts.apply(self.expand_contractions)
+
+        return x
+
+
+class NlpSpacyOperator(BaseEstimator):
+    """It's the base class of the operators backed by a spaCy model, it parses the text column in batches."""
+
+    # spaCy components needed by the operator on top of the tokenizer, None means the full pipeline
+    components: Optional[Sequence[str]] = None
+
+    @property
+    def nlp(self) -> Language:
+        """
+        The spaCy model of the operator, taken from the process-wide registry so it is neither
+        duplicated between operators nor pickled with them
+        """
+        return get_spacy_model(SPACY_MODEL, self.components)
+
+    def fit(self, x: Any, y: Any = None) -> __qualname__:
+        if self.doc_column is None:
+            self.preload()
+
+        return self
+
+    def preload(self) -> None:
+        """
+        It loads the spaCy model of the operator in the registry if it is not already loaded
+        """
+        get_spacy_model(SPACY_MODEL, self.components)
+
+    def parse(self, texts: Iterable[str]) -> Iterator[Doc]:
+        """
+        It runs the spaCy model over the texts in batches with `nlp.pipe`, which is much faster than
+        calling the model one text at a time
+
+        :param texts: The texts to be parsed
+        :type texts: Iterable[str]
+        :return: An iterator of spaCy documents
+        """
+        return self.nlp.pipe(texts, batch_size=self.batch_size, n_process=self.n_process)
+
+    def docs(self, x: pd.DataFrame) -> Iterable[Doc]:
+        """
+        It returns the documents of the dataframe, read from the doc column when the text has already
+        been parsed by a NlpSpacyParse step, or parsed from the text column otherwise
+
+        :param x: The dataframe
+        :type x: pd.DataFrame
+        :return: An iterable of spaCy documents
+        """
+        if self.doc_column is not None:
+            return x[self.doc_column]
+
+        return self.parse(x[self.text_column])
+
+    def process_doc(self, doc: Doc) -> Any:
+        """
+        It takes a parsed spaCy document and returns the value stored in the new column
+
+        :param doc: The spaCy document
+        :type doc: Doc
+        """
+        raise NotImplementedError
+
+    def transform(self, x: Any) -> pd.DataFrame:
+        """
+        The function parses the text column in batches, and returns a dataframe with a new column that
+        contains the processed documents
+
+        :param x: Any - the dataframe that will be passed to the transform method
+        :type x: Any
+        :return: A dataframe with the new column added.
+        """
+        values = [self.process_doc(doc) for doc in self.docs(x)]
+        x[self.new_column] = pd.Series(values, index=x.index, dtype=object)
 
         return x
 
 
-class NlpRemoveStopwords(BaseEstimator):
+class NlpSpacyParse(NlpSpacyOperator):
+    """It parses the text column once and keeps the spaCy documents in a column for the next spaCy operators."""
+
+    def __init__(
+        self,
+        text_column: str,
+        new_column: str = None,
+        batch_size: int = 1000,
+        n_process: int = 1,
+        components: Optional[Sequence[str]] = None,
+    ) -> None:
+        """
+        This function takes in a text column and the name of the column that will hold the documents.
+        The following spaCy operators read this column through their `doc_column` parameter instead of
+        parsing the text again. Drop the column before the end of the pipeline, spaCy documents are
+        expensive to send back from the workers
+
+        :param text_column: The column in the dataframe that contains the text to be parsed
+        :type text_column: str
+        :param new_column: The name of the column that will hold the documents, defaults to
+        `<text_column>_doc`
+        :type new_column: str
+        :param batch_size: The number of texts parsed together by `nlp.pipe`, defaults to 1000
+        :type batch_size: int (optional)
+        :param n_process: The number of processes used by `nlp.pipe`, defaults to 1. Keep it to 1 when
+        the operator runs inside the workers of a PipelineTransform
+        :type n_process: int (optional)
+        :param components: The spaCy components needed by the following operators, e.g. the union of
+        their `components`. If None, the full pipeline is run
+        :type components: Sequence[str] (optional)
+        """
+        self.text_column = text_column
+        if new_column is None:
+            self.new_column = f"{text_column}_doc"
+        else:
+            self.new_column = new_column
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.components = components
+        self.doc_column = None
+
+    def process_doc(self, doc: Doc) -> Doc:
+        return doc
+
+
+class NlpRemoveStopwords(NlpSpacyOperator):
     """It's a class that takes a list of stopwords and removes them from a list of words."""
 
-    def __init__(self, text_column: str, new_column: str = None) -> None:
+    components = ()
+
+    def __init__(
+        self,
+        text_column: str,
+        new_column: str = None,
+        batch_size: int = 1000,
+        n_process: int = 1,
+        doc_column: str = None,
+    ) -> None:
         """
         This function takes in a text column and a new column name and returns a new column with the new
         column name
@@ -108,31 +544,35 @@ class NlpRemoveStopwords(BaseEstimator):
         :type text_column: str
         :param new_column: The name of the new column that will be created in the dataframe
         :type new_column: str
+        :param batch_size: The number of texts parsed together by `nlp.pipe`, defaults to 1000
+        :type batch_size: int (optional)
+        :param n_process: The number of processes used by `nlp.pipe`, defaults to 1. Keep it to 1 when
+        the operator runs inside the workers of a PipelineTransform
+        :type n_process: int (optional)
+        :param doc_column: The column holding the documents parsed by a previous NlpSpacyParse step. If
+        set, the text is not parsed again and no model is loaded by this operator
+        :type doc_column: str (optional)
         """
-        self.nlp = None
         self.text_column = text_column
         if new_column is None:
             self.new_column = text_column
         else:
             self.new_column = new_column
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.doc_column = doc_column
 
-    def fit(self, x: Any, y: Any = None) -> __qualname__:
-        self.nlp = spacy.load("en_core_web_sm")
-
-        return self
-
-    def remove_stopwords(self, text: str) -> str:
+    def process_doc(self, doc: Doc) -> str:
         """
-        It takes a string of text, creates a spaCy document, iterates through the tokens in the
-        document, and if the token is not a stopword, it adds the token to a list.
+        It iterates through the tokens in the document, and if the token is not a stopword, it adds the
+        token to a list.
 
         The function then returns the list as a string
 
-        :param text: The text to be processed
-        :type text: str
+        :param doc: The spaCy document
+        :type doc: Doc
         :return: A string
         """
-        doc = self.nlp(text)
         text_no_stopwords = []
         for token in doc:
             if not token.is_stop:
@@ -140,24 +580,30 @@ class NlpRemoveStopwords(BaseEstimator):
 
         return "".join(text_no_stopwords)
 
-    def transform(self, x: Any) -> pd.DataFrame:
+    def remove_stopwords(self, text: str) -> str:
         """
-        The function takes in a dataframe, and a column name, and returns a dataframe with a new column
-        that has the stopwords removed from the original column
+        It takes a string of text, creates a spaCy document, and removes the stopwords from it
 
-        :param x: Any - the dataframe that will be passed to the transform method
-        :type x: Any
-        :return: A dataframe with the new column added.
+        :param text: The text to be processed
+        :type text: str
+        :return: A string
         """
-        x[self.new_column] = x[self.text_column].apply(self.remove_stopwords)
-
-        return x
+        return self.process_doc(self.nlp(text))
 
 
-class NlpTextToSentences(BaseEstimator):
+class NlpTextToSentences(NlpSpacyOperator):
     """It takes a string of text and returns a list of sentences."""
 
-    def __init__(self, text_column: str, new_column: str = None) -> None:
+    components = ("senter",)
+
+    def __init__(
+        self,
+        text_column: str,
+        new_column: str = None,
+        batch_size: int = 1000,
+        n_process: int = 1,
+        doc_column: str = None,
+    ) -> None:
         """
         This function takes in a text column and a new column name and returns a new column with the new
         column name
@@ -166,18 +612,33 @@ class NlpTextToSentences(BaseEstimator):
         :type text_column: str
         :param new_column: The name of the new column that will be created in the dataframe
         :type new_column: str
+        :param batch_size: The number of texts parsed together by `nlp.pipe`, defaults to 1000
+        :type batch_size: int (optional)
+        :param n_process: The number of processes used by `nlp.pipe`, defaults to 1. Keep it to 1 when
+        the operator runs inside the workers of a PipelineTransform
+        :type n_process: int (optional)
+        :param doc_column: The column holding the documents parsed by a previous NlpSpacyParse step. If
+        set, the text is not parsed again and no model is loaded by this operator
+        :type doc_column: str (optional)
         """
-        self.nlp = None
         self.text_column = text_column
         if new_column is None:
             self.new_column = text_column
         else:
             self.new_column = new_column
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.doc_column = doc_column
 
-    def fit(self, x: Any, y: Any = None) -> __qualname__:
-        self.nlp = spacy.load("en_core_web_sm")
+    def process_doc(self, doc: Doc) -> List[str]:
+        """
+        It returns a list of strings, where each string is a sentence from the document
 
-        return self
+        :param doc: The spaCy document
+        :type doc: Doc
+        :return: A list of strings.
+        """
+        return [sentence.text for sentence in doc.sents]
 
     def text_to_sentences(self, text: str) -> List[str]:
         """
@@ -188,18 +649,22 @@ class NlpTextToSentences(BaseEstimator):
         :type text: str
         :return: A list of strings.
         """
-        return [sentence.text for sentence in self.nlp(text).sents]
+        return self.process_doc(self.nlp(text))
 
-    def transform(self, x: Any) -> pd.DataFrame:
-        x[self.new_column] = x[self.text_column].apply(self.text_to_sentences)
 
-        return x
-
-
-class NlpTextToWords(BaseEstimator):
+class NlpTextToWords(NlpSpacyOperator):
     """It takes a string of text, and returns a list of words."""
 
-    def __init__(self, text_column: str, new_column: str = None) -> None:
+    components = ()
+
+    def __init__(
+        self,
+        text_column: str,
+        new_column: str = None,
+        batch_size: int = 1000,
+        n_process: int = 1,
+        doc_column: str = None,
+    ) -> None:
         """
         This function takes in a text column and a new column name and returns a new column with the new
         column name
@@ -208,18 +673,33 @@ class NlpTextToWords(BaseEstimator):
         :type text_column: str
         :param new_column: The name of the new column that will be created in the dataframe
         :type new_column: str
+        :param batch_size: The number of texts parsed together by `nlp.pipe`, defaults to 1000
+        :type batch_size: int (optional)
+        :param n_process: The number of processes used by `nlp.pipe`, defaults to 1. Keep it to 1 when
+        the operator runs inside the workers of a PipelineTransform
+        :type n_process: int (optional)
+        :param doc_column: The column holding the documents parsed by a previous NlpSpacyParse step. If
+        set, the text is not parsed again and no model is loaded by this operator
+        :type doc_column: str (optional)
         """
-        self.nlp = None
         self.text_column = text_column
         if new_column is None:
             self.new_column = text_column
         else:
             self.new_column = new_column
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.doc_column = doc_column
 
-    def fit(self, x: Any, y: Any = None) -> __qualname__:
-        self.nlp = spacy.load("en_core_web_sm")
+    def process_doc(self, doc: Doc) -> List[str]:
+        """
+        It returns the list of tokens of the document
 
-        return self
+        :param doc: The spaCy document
+        :type doc: Doc
+        :return: A list of tokens
+        """
+        return [token.text for token in doc]
 
     def text_to_tokens(self, text: str) -> List[str]:
         """
@@ -229,26 +709,23 @@ class NlpTextToWords(BaseEstimator):
         :type text: str
         :return: A list of tokens
         """
-        return [token.text for token in self.nlp(text)]
+        return self.process_doc(self.nlp(text))
 
-    def transform(self, x: Any) -> pd.DataFrame:
-        """
-        The function takes a dataframe, and a column of text, and returns a dataframe with a new column
-        of tokens
-
-        :param x: Any - the dataframe that will be passed to the transform function
-        :type x: Any
-        :return: A dataframe with the new column added.
-        """
-        x[self.new_column] = x[self.text_column].apply(self.text_to_tokens)
 
-        return x
-
-
-class NlpSpeechTagging(BaseEstimator):
+class NlpSpeechTagging(NlpSpacyOperator):
     """It's a wrapper for a scikit-learn estimator that takes a list of strings as input and returns a list of strings as output."""
 
-    def __init__(self, text_column: str, new_column: str = None) -> None:
+    components = ("tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer")
+
+    def __init__(
+        self,
+        text_column: str,
+        new_column: str = None,
+        batch_size: int = 1000,
+        n_process: int = 1,
+        doc_column: str = None,
+        output: str = "records",
+    ) -> None:
         """
         This function takes in a text column and a new column name and returns a new column with the new
         column name
@@ -257,78 +734,113 @@ class NlpSpeechTagging(BaseEstimator):
         :type text_column: str
         :param new_column: The name of the new column that will be created in the dataframe
         :type new_column: str
-        """
-        self.nlp = None
+        :param batch_size: The number of texts parsed together by `nlp.pipe`, defaults to 1000
+        :type batch_size: int (optional)
+        :param n_process: The number of processes used by `nlp.pipe`, defaults to 1. Keep it to 1 when
+        the operator runs inside the workers of a PipelineTransform
+        :type n_process: int (optional)
+        :param doc_column: The column holding the documents parsed by a previous NlpSpacyParse step. If
+        set, the text is not parsed again and no model is loaded by this operator
+        :type doc_column: str (optional)
+        :param output: The format of the new column, one list of dicts per text with "records", one dict
+        of lists per text with "columns", defaults to "records". For typed columns, see `token_table`
+        :type output: str (optional)
+        """
+        assert output in ["records", "columns"]
         self.text_column = text_column
         if new_column is None:
             self.new_column = text_column
         else:
             self.new_column = new_column
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.doc_column = doc_column
+        self.output = output
 
-    def fit(self, x: Any, y: Any = None) -> __qualname__:
-        self.nlp = spacy.load("en_core_web_sm")
+    def process_doc(self, doc: Doc) -> Union[List[Dict[str, Any]], Dict[str, List[Any]]]:
+        """
+        The function takes a spaCy document as input, and returns the tokens, lemmas, parts of speech,
+        tags, dependencies, sentiment, shape, is_alpha, and is_stopwords of its tokens, as a list of
+        records or, with the "columns" output, as a dict of lists
 
-        return self
+        :param doc: The spaCy document
+        :type doc: Doc
+        :return: A list of records or a dict of columns
+        """
+        rows = [[getattr(token, attribute) for attribute in POS_ATTRIBUTES.values()] for token in doc]
+        if self.output == "records":
+            return [dict(zip(POS_ATTRIBUTES, row)) for row in rows]
+
+        return {name: [row[i] for row in rows] for i, name in enumerate(POS_ATTRIBUTES)}
 
-    def pos(self, text: str) -> Dict[str, str]:
+    def token_columns(self, docs: Iterable[Doc]) -> Tuple[np.ndarray, Dict[str, list]]:
         """
-        The function takes a string as input, and returns a dictionary of the tokens, lemmas, parts of
-        speech, tags, dependencies, sentiment, shape, is_alpha, and is_stopwords
+        It collects the attributes of the tokens of all the documents in flat lists, one per attribute,
+        with the offsets of the first token of each document
 
-        :param text: The text to be processed
-        :type text: str
-        :return: A dictionary of records
+        :param docs: The spaCy documents
+        :type docs: Iterable[Doc]
+        :return: The offsets, one more than the number of documents, and the attribute lists
         """
-        doc = self.nlp(text)
-        pos_tagging = []
-        for token in doc:
-            pos_tagging.append(
-                [
-                    token.text,
-                    token.lemma_,
-                    token.pos_,
-                    token.tag_,
-                    token.dep_,
-                    token.sentiment,
-                    token.shape_,
-                    token.is_alpha,
-                    token.is_stop,
-                ]
-            )
-
-        return pd.DataFrame(
-            pos_tagging,
-            columns=[
-                "token",
-                "lemma",
-                "pos",
-                "tag",
-                "dependency",
-                "sentiment",
-                "shape",
-                "is_alpha",
-                "is_stopwords",
-            ],
-        ).to_dict("records")
+        columns = {name: [] for name in POS_ATTRIBUTES}
+        lengths = []
+        for doc in docs:
+            lengths.append(len(doc))
+            for name, attribute in POS_ATTRIBUTES.items():
+                columns[name].extend(getattr(token, attribute) for token in doc)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
 
-    def transform(self, x: Any) -> pd.DataFrame:
+        return offsets, columns
+
+    def token_table(self, x: pd.DataFrame) -> pd.DataFrame:
         """
-        The function takes a dataframe, and a column of text, and returns a dataframe with a new column
-        of text that has been transformed by the function
+        It returns the tokens of the text column in long format: one row per token, with the index of
+        its text in `row_id`, its position in the text in `token_id`, and one typed column per
+        attribute. The tags are categoricals, the flags booleans and the sentiment a float
 
-        :param x: Any - the dataframe that you want to transform
-        :type x: Any
-        :return: A dataframe with the new column added.
+        :param x: The dataframe
+        :type x: pd.DataFrame
+        :return: The token table
         """
-        x[self.new_column] = x[self.text_column].map(self.pos)
+        offsets, columns = self.token_columns(self.docs(x))
+        lengths = np.diff(offsets)
+        table = pd.DataFrame(
+            {
+                "row_id": np.repeat(x.index.to_numpy(), lengths),
+                "token_id": np.arange(offsets[-1]) - np.repeat(offsets[:-1], lengths),
+            }
+        )
+        for name, values in columns.items():
+            table[name] = pd.Series(values, dtype=POS_DTYPES[name])
 
-        return x
+        return table
+
+    def pos(self, text: str) -> List[Dict[str, Any]]:
+        """
+        The function takes a string as input, and returns a dictionary of the tokens, lemmas, parts of
+        speech, tags, dependencies, sentiment, shape, is_alpha, and is_stopwords
+
+        :param text: The text to be processed
+        :type text: str
+        :return: A dictionary of records
+        """
+        return self.process_doc(self.nlp(text))
 
 
-class NlpWordLemmatizer(BaseEstimator):
+class NlpWordLemmatizer(NlpSpacyOperator):
     """It's a wrapper for the NLTK WordNetLemmatizer class that implements the scikit-learn transformer API."""
 
-    def __init__(self, text_column: str, new_column: str = None) -> None:
+    components = ("tok2vec", "tagger", "attribute_ruler", "lemmatizer")
+
+    def __init__(
+        self,
+        text_column: str,
+        new_column: str = None,
+        batch_size: int = 1000,
+        n_process: int = 1,
+        doc_column: str = None,
+    ) -> None:
         """
         This function takes in a text column and a new column name and returns a new column with the new
         column name
@@ -337,57 +849,58 @@ class NlpWordLemmatizer(BaseEstimator):
         :type text_column: str
         :param new_column: The name of the new column that will be created in the dataframe
         :type new_column: str
+        :param batch_size: The number of texts parsed together by `nlp.pipe`, defaults to 1000
+        :type batch_size: int (optional)
+        :param n_process: The number of processes used by `nlp.pipe`, defaults to 1. Keep it to 1 when
+        the operator runs inside the workers of a PipelineTransform
+        :type n_process: int (optional)
+        :param doc_column: The column holding the documents parsed by a previous NlpSpacyParse step. If
+        set, the text is not parsed again and no model is loaded by this operator
+        :type doc_column: str (optional)
         """
-        self.nlp = None
         self.text_column = text_column
         if new_column is None:
             self.new_column = text_column
         else:
             self.new_column = new_column
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.doc_column = doc_column
 
-    def fit(self, x: Any, y: Any = None) -> __qualname__:
-        self.nlp = spacy.load("en_core_web_sm")
-
-        return self
-
-    def lemmatize(self, text: str) -> str:
+    def process_doc(self, doc: Doc) -> str:
         """
-        The function takes a string as input, and returns a string as output.
-
-        The input string is passed to the nlp object, which is a spaCy object.
-
-        The nlp object returns a doc object, which is a spaCy object.
-
         The doc object is iterated over, and each token is lemmatized.
 
         The lemmatized tokens are returned as a string.
 
-        :param text: The text to be lemmatized
-        :type text: str
+        :param doc: The spaCy document
+        :type doc: Doc
         :return: A string of lemmatized tokens
         """
-        doc = self.nlp(text)
         tokens = [token.lemma_ for token in doc]
 
         return " ".join(tokens)
 
-    def transform(self, x: Any) -> pd.DataFrame:
+    def lemmatize(self, text: str) -> str:
         """
-        The function takes in a dataframe, and returns a dataframe with a new column that is the
-        lemmatized version of the text column
+        The function takes a string as input, and returns a string as output.
 
-        :param x: Any - the dataframe that you want to transform
-        :type x: Any
-        :return: A dataframe with a new column called 'lemmatized_text'
-        """
-        x[self.new_column] = x[self.text_column].map(self.lemmatize)
+        The input string is passed to the nlp object, which is a spaCy object.
 
-        return x
+        The nlp object returns a doc object, which is lemmatized token by token.
+
+        :param text: The text to be lemmatized
+        :type text: str
+        :return: A string of lemmatized tokens
+        """
+        return self.process_doc(self.nlp(text))
 
 
 class NlpReplaceEmojis(BaseEstimator):
     """Replaces emojis with their textual description"""
 
+    text_method = "clean_emojis"
+
     def __init__(self, text_column: str, new_column: str = None, how: str = "replace") -> None:
         """
         The function takes in a text column, a new column, and a how parameter. If the new column is not
@@ -425,7 +938,7 @@ class NlpReplaceEmojis(BaseEstimator):
         """
         emojis = self.emot_obj.emoji(text)
         if emojis["flag"]:
-            for index in range(len(emojis) - 1, -1, -1):
+            for index in range(len(emojis["value"]) - 1, -1, -1):
                 target_value = emojis["mean"][index] if self.how == "replace" else ""
                 start, end = emojis["location"][index]
                 text = text[:start] + target_value + text[end:]
@@ -450,6 +963,8 @@ class NlpReplaceEmojis(BaseEstimator):
 class NlpReplaceEmoticons(BaseEstimator):
     """Replaces emoticons with their corresponding words."""
 
+    text_method = "clean_emoticons"
+
     def __init__(self, text_column: str, new_column: str = None, how: str = "replace") -> None:
         """
         The function takes in a text column, a new column, and a how parameter. If the new column is not
@@ -488,7 +1003,7 @@ class NlpReplaceEmoticons(BaseEstimator):
         """
         emoticons = self.emot_obj.emoticons(text)
         if emoticons["flag"]:
-            for index in range(len(emoticons) - 1, -1, -1):
+            for index in range(len(emoticons["value"]) - 1, -1, -1):
                 target_value = emoticons["mean"][index] if self.how == "replace" else ""
                 start, end = emoticons["location"][index]
                 text = text[:start] + target_value + text[end:]
@@ -510,9 +1025,92 @@ class NlpReplaceEmoticons(BaseEstimator):
         return x
 
 
+class NlpReplaceEmotes(BaseEstimator):
+    """Replaces emojis and emoticons with their textual description, in a single pass over each text."""
+
+    text_method = "replace_emotes"
+
+    def __init__(
+        self,
+        text_column: str,
+        new_column: str = None,
+        how: str = "replace",
+        emojis: bool = True,
+        emoticons: bool = True,
+    ) -> None:
+        """
+        The function takes in a text column, a new column, and a how parameter. The emojis and emoticons
+        known by emot are compiled once in a trie-shaped regex, and every text is scanned once for both
+
+        :param text_column: The column in the dataframe that contains the text you want to clean
+        :type text_column: str
+        :param new_column: The name of the new column that will be created. If None, the name of the
+        text_column will be used
+        :type new_column: str
+        :param how: replace to replace them with their meaning, anything else removes them, defaults to
+        replace
+        :type how: str (optional)
+        :param emojis: replace the emojis, defaults to True
+        :type emojis: bool (optional)
+        :param emoticons: replace the emoticons, defaults to True
+        :type emoticons: bool (optional)
+        """
+        assert emojis or emoticons
+        self.text_column = text_column
+        if new_column is None:
+            self.new_column = text_column
+        else:
+            self.new_column = new_column
+        self.how = how
+        self.emojis = emojis
+        self.emoticons = emoticons
+
+    @property
+    def matcher(self) -> Tuple[re.Pattern, Optional[re.Pattern], Dict[str, str]]:
+        return get_emote_matcher(self.emojis, self.emoticons)
+
+    def fit(self, x: Any, y: Any = None) -> __qualname__:
+        get_emote_matcher(self.emojis, self.emoticons)
+
+        return self
+
+    def replace_emotes(self, text: str) -> str:
+        """
+        It replaces the emojis and emoticons of the text with their meaning, or removes them. Emojis are
+        never ASCII, so ASCII texts are only scanned for emoticons, or not at all
+
+        :param text: The text to be cleaned
+        :type text: str
+        :return: The cleaned text
+        """
+        pattern, ascii_pattern, meanings = self.matcher
+        if text.isascii():
+            if ascii_pattern is None:
+                return text
+            pattern = ascii_pattern
+        if self.how == "replace":
+            return pattern.sub(lambda match: meanings.get(match.group().strip(), match.group()), text)
+
+        return pattern.sub("", text)
+
+    def transform(self, x: Any) -> pd.DataFrame:
+        """
+        It replaces the emojis and emoticons of the text column with their meaning, or removes them
+
+        :param x: Any - the dataframe you want to transform
+        :type x: Any
+        :return: A dataframe with the new column added.
+        """
+        x[self.new_column] = x[self.text_column].map(self.replace_emotes)
+
+        return x
+
+
 class NlpDeDuplicatesSpace(BaseEstimator):
     """It takes a list of strings, and returns a list of strings with duplicates removed."""
 
+    text_method = "remove_multiple_spaces"
+
     def __init__(self, text_column: str, new_column: str = None) -> None:
         """
         The function takes in a text column and a new column name, and if the new column name is not
@@ -542,7 +1140,7 @@ class NlpDeDuplicatesSpace(BaseEstimator):
         :type text: str
         :return: A string with multiple spaces replaced by a single space.
         """
-        return re.sub(" {2,}", " ", text)
+        return MULTIPLE_SPACES.sub(" ", text)
 
     def transform(self, x: Any) -> pd.DataFrame:
         """
@@ -564,6 +1162,8 @@ class NlpDeDuplicatesSpace(BaseEstimator):
 class NlpReplaceWordRepetition(BaseEstimator):
     """It replaces word repetition with a single instance of the word"""
 
+    text_method = "replace_words_rep"
+
     def __init__(self, text_column: str, new_column: str = None) -> None:
         """
         The function takes in a text column and a new column name, and if the new column name is not
@@ -606,9 +1206,7 @@ class NlpReplaceWordRepetition(BaseEstimator):
         :return: the text with the repeated words replaced by the word itself and the number of times it
         was repeated.
         """
-        word_rep = re.compile(r"(\b\w+\W+)(\1{2,})")
-
-        return word_rep.sub(self._replace_group, text)
+        return WORD_REPETITION.sub(self._replace_group, text)
 
     def transform(self, x: Any) -> pd.DataFrame:
         """
@@ -628,6 +1226,8 @@ class NlpReplaceWordRepetition(BaseEstimator):
 class NlpRemoveCharRepetition(BaseEstimator):
     """It removes repeated characters from a string."""
 
+    text_method = "replace_char_rep"
+
     def __init__(self, text_column: str, new_column: str = None) -> None:
         """
         The function takes in a text column and a new column name, and if the new column name is not
@@ -670,9 +1270,7 @@ class NlpRemoveCharRepetition(BaseEstimator):
         :return: the text with the repeated characters replaced by the character and the number of times
         it was repeated.
         """
-        char_rep = re.compile(r"(\S)(\1{2,})")
-
-        return char_rep.sub(self._replace_group, text)
+        return CHAR_REPETITION.sub(self._replace_group, text)
 
     def transform(self, x: Any) -> pd.DataFrame:
         """
@@ -686,3 +1284,179 @@ class NlpRemoveCharRepetition(BaseEstimator):
         x[self.new_column] = x[self.text_column].map(self.replace_char_rep)
 
         return x
+
+
+class NlpFusedText(BaseEstimator):
+    """It applies a chain of text operators to each text in a single pass over the column."""
+
+    def __init__(self, text_column: str, operators: List[BaseEstimator], new_column: str = None) -> None:
+        """
+        The function takes in a text column and the operators to chain. Every operator must declare the
+        `text_method` applied to each text, and the output of an operator is the input of the next one
+
+        :param text_column: The column containing the text you want to clean
+        :type text_column: str
+        :param operators: The text operators, in the order they are applied
+        :type operators: List[BaseEstimator]
+        :param new_column: The name of the new column that will be created. If not specified, the new
+        column will have the same name as the text column
+        :type new_column: str
+        """
+        self.text_column = text_column
+        self.operators = operators
+        if new_column is None:
+            self.new_column = text_column
+        else:
+            self.new_column = new_column
+
+    def fit(self, x: Any, y: Any = None) -> __qualname__:
+        for operator in self.operators:
+            operator.fit(x)
+
+        return self
+
+    def transform(self, x: Any) -> pd.DataFrame:
+        """
+        The function applies the text method of every operator to each text of the column, one text at a
+        time, so the column is scanned once whatever the number of operators
+
+        :param x: Any - the dataframe that will be passed to the transform method
+        :type x: Any
+        :return: A dataframe with the new column added.
+        """
+        functions = [getattr(operator, operator.text_method) for operator in self.operators]
+
+        def apply(text: str) -> str:
+            for function in functions:
+                text = function(text)
+            return text
+
+        x[self.new_column] = x[self.text_column].map(apply)
+
+        return x
+
+
+class NlpTextNormalizer(BaseEstimator):
+    """It removes multiple spaces, word repetitions and character repetitions in a single pass."""
+
+    # the normalization steps, with their precompiled pattern and replacement
+    patterns = {
+        "spaces": (MULTIPLE_SPACES, " "),
+        "word_repetition": (WORD_REPETITION, r"\1"),
+        "char_repetition": (CHAR_REPETITION, r"\1"),
+    }
+
+    def __init__(
+        self,
+        text_column: str,
+        new_column: str = None,
+        steps: Sequence[str] = ("spaces", "word_repetition", "char_repetition"),
+        vectorized: bool = False,
+    ) -> None:
+        """
+        The function takes in a text column, a new column name and the normalization steps to apply. The
+        steps do the same as NlpDeDuplicatesSpace, NlpReplaceWordRepetition and NlpRemoveCharRepetition
+
+        :param text_column: The column containing the text you want to clean
+        :type text_column: str
+        :param new_column: The name of the new column that will be created. If not specified, the new
+        column will have the same name as the text column
+        :type new_column: str
+        :param steps: The steps to apply in order, among "spaces", "word_repetition" and
+        "char_repetition", defaults to all of them
+        :type steps: Sequence[str] (optional)
+        :param vectorized: apply each step to the whole column with `Series.str.replace` instead of
+        applying all the steps to each text in one pass, defaults to False
+        :type vectorized: bool (optional)
+        """
+        for step in steps:
+            assert step in self.patterns, f"unknown normalization step {step}"
+        self.text_column = text_column
+        if new_column is None:
+            self.new_column = text_column
+        else:
+            self.new_column = new_column
+        self.steps = steps
+        self.vectorized = vectorized
+
+    def fit(self, x: Any, y: Any = None) -> __qualname__:
+        return self
+
+    def normalize(self, text: str) -> str:
+        """
+        It applies the normalization steps to the text, one after the other
+
+        :param text: The text to be normalized
+        :type text: str
+        :return: The normalized text
+        """
+        for step in self.steps:
+            pattern, replacement = self.patterns[step]
+            text = pattern.sub(replacement, text)
+
+        return text
+
+    def transform(self, x: Any) -> pd.DataFrame:
+        """
+        It normalizes the text column, either in one pass per text or with one vectorized replace per
+        step
+
+        :param x: Any - the dataframe that will be passed to the transform method
+        :type x: Any
+        :return: A dataframe with the new column added.
+        """
+        if self.vectorized:
+            texts = x[self.text_column]
+            for step in self.steps:
+                pattern, replacement = self.patterns[step]
+                texts = texts.str.replace(pattern, replacement, regex=True)
+            x[self.new_column] = texts
+        else:
+            x[self.new_column] = x[self.text_column].map(self.normalize)
+
+        return x
+
+
+class NlpDeduplicated(BaseEstimator):
+    """It runs a text operator once per distinct text of the column, and broadcasts the results to the rows."""
+
+    def __init__(self, operator: BaseEstimator) -> None:
+        """
+        The function takes in the operator to run on the distinct texts. The operator must only read its
+        `text_column` and write its `new_column`, one value per row, like the Nlp operators do
+
+        :param operator: The text operator, e.g. NlpWordLemmatizer("text")
+        :type operator: BaseEstimator
+        """
+        assert getattr(operator, "doc_column", None) is None, "the operator must read the text, not the docs"
+        self.operator = operator
+
+    @property
+    def text_column(self) -> str:
+        return self.operator.text_column
+
+    @property
+    def new_column(self) -> str:
+        return self.operator.new_column
+
+    def fit(self, x: Any, y: Any = None) -> __qualname__:
+        self.operator.fit(x)
+
+        return self
+
+    def transform(self, x: Any) -> pd.DataFrame:
+        """
+        The function factorizes the text column, applies the operator to the distinct texts only, and
+        takes the result of each row from its code. Missing texts give missing values, and duplicated
+        texts share the same result object
+
+        :param x: Any - the dataframe that will be passed to the transform method
+        :type x: Any
+        :return: A dataframe with the new column added.
+        """
+        codes, uniques = pd.factorize(x[self.text_column])
+        unique_df = self.operator.transform(pd.DataFrame({self.text_column: uniques}))
+        values = pd.api.extensions.take(unique_df[self.new_column].to_numpy(), codes, allow_fill=True)
+        x[self.new_column] = pd.Series(values, index=x.index)
+
+        return x
@@ -0,0 +1,493 @@
+import ast
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sklearn.pipeline import Pipeline
+
+from src.settings import LOGGER
+
+from src.transform.pandas_operator import *
+from src.transform.nlp_operator import *
+
+
+QUERY_KEYWORDS = {"and", "or", "not", "in", "is", "True", "False", "None", "nan", "inf"}
+QUERY_STRING = re.compile(r"'[^']*'|\"[^\"]*\"")
+QUERY_NAME = re.compile(r"`([^`]+)`|(?<![\w.@])([A-Za-z_]\w*)")
+SIMPLE_QUERY = re.compile(r"^\s*(==|!=|<=|>=|<|>)\s*(.+?)\s*$")
+# steps after which only the columns they read are left, so no other input column is needed
+PROJECTION_STEPS = (DataFrameColumnsSelection, DataFrameInplodeColumn, DataFrameReadCsv, DataFrameReadParquet)
+# regex cleaning steps and the NlpTextNormalizer step doing the same
+NORMALIZER_STEPS = {
+    NlpDeDuplicatesSpace: "spaces",
+    NlpReplaceWordRepetition: "word_repetition",
+    NlpRemoveCharRepetition: "char_repetition",
+}
+# steps that keep a subset of the rows, deciding on each row independently
+FILTER_STEPS = (DataFrameQueryFilter, DataFrameDropEmptyRows)
+# steps whose result depends on the set of rows they receive, or with side effects, no step can cross them
+BARRIER_STEPS = (
+    DataFrameValueFrequency,
+    DataFrameExplodeColumn,
+    DataFrameInplodeColumn,
+    DataFrameReadCsv,
+    DataFrameReadParquet,
+    DataFrameToCsv,
+    DataFrameToParquet,
+)
+
+
+def query_columns(step: DataFrameQueryFilter) -> Set[str]:
+    """
+    > Find the columns used by the query of a DataFrameQueryFilter. It can return names that are not
+    columns, e.g. functions called in the query, but never misses a column
+
+    :param step: The query filter
+    :type step: DataFrameQueryFilter
+    :return: The set of column names
+    """
+    query = QUERY_STRING.sub(" ", f"{step.text_column} {step.query}")
+    names = {quoted or name for quoted, name in QUERY_NAME.findall(query)}
+
+    return names - QUERY_KEYWORDS
+
+
+def step_reads(step: Any) -> Optional[Set[str]]:
+    """
+    > Find the columns a pipeline step reads from its input dataframe
+
+    :param step: The pipeline step
+    :type step: Any
+    :return: The set of columns, None if the step is unknown
+    """
+    if isinstance(step, DataFrameQueryFilter):
+        return query_columns(step)
+    if isinstance(step, (DataFrameColumnsSelection, DataFrameColumnsDrop)):
+        return set(step.columns)
+    if isinstance(step, DataFrameColumnsRename):
+        return set()
+    if isinstance(step, DataFrameInplodeColumn):
+        return {step.key_column, step.agg_column}
+    if isinstance(step, (DataFrameReadCsv, DataFrameReadParquet, DataFrameEmptyColumn)):
+        return set()
+    if hasattr(step, "text_column"):
+        reads = {step.text_column}
+        if getattr(step, "doc_column", None) is not None:
+            reads.add(step.doc_column)
+        return reads
+
+    return None
+
+
+def step_writes(step: Any) -> Set[str]:
+    """
+    > Find the columns a pipeline step creates or overwrites
+
+    :param step: The pipeline step
+    :type step: Any
+    :return: The set of columns
+    """
+    if isinstance(step, DataFrameColumnsRename):
+        return set(step.columns_mapping.values())
+    if isinstance(step, DataFrameExplodeColumn):
+        return {step.text_column}
+    if isinstance(step, DataFrameInplodeColumn):
+        return {step.agg_column}
+    new_column = getattr(step, "new_column", None)
+
+    return set() if new_column is None else {new_column}
+
+
+def _input_columns(reads: Set[str], produced: Set[str], renamed: Dict[str, str]) -> Set[str]:
+    """
+    > Find the input columns behind the columns a step reads: a column produced by a previous step
+    needs no input column, and a renamed column needs the input column it was renamed from
+
+    :param reads: The columns read by the step
+    :type reads: Set[str]
+    :param produced: The columns produced by the previous steps
+    :type produced: Set[str]
+    :param renamed: The renamed columns, mapped to their input column
+    :type renamed: Dict[str, str]
+    :return: The set of input columns
+    """
+    columns = set()
+    for column in reads:
+        if column in renamed:
+            columns.add(renamed[column])
+        elif column not in produced:
+            columns.add(column)
+
+    return columns
+
+
+def _track_rename(step: DataFrameColumnsRename, produced: Set[str], renamed: Dict[str, str]) -> None:
+    """
+    > Follow the columns renamed by a DataFrameColumnsRename step back to the columns they come from
+
+    :param step: The rename step
+    :type step: DataFrameColumnsRename
+    :param produced: The columns produced by the previous steps, updated in place
+    :type produced: Set[str]
+    :param renamed: The renamed columns, mapped to their input column, updated in place
+    :type renamed: Dict[str, str]
+    """
+    for old, new in step.columns_mapping.items():
+        if old in produced:
+            produced.add(new)
+        else:
+            renamed[new] = renamed.get(old, old)
+
+
+def _track_writes(step: Any, produced: Set[str], renamed: Dict[str, str]) -> None:
+    """
+    > Record the columns written by a step, which no longer come from the input
+
+    :param step: The pipeline step
+    :type step: Any
+    :param produced: The columns produced by the previous steps, updated in place
+    :type produced: Set[str]
+    :param renamed: The renamed columns, mapped to their input column, updated in place
+    :type renamed: Dict[str, str]
+    """
+    for column in step_writes(step):
+        produced.add(column)
+        renamed.pop(column, None)
+
+
+def required_columns(pipeline: Pipeline) -> Optional[List[str]]:
+    """
+    > Find the input columns the pipeline actually uses, so the reader can skip the other ones. The
+    steps are walked until one of them keeps only known columns (a DataFrameColumnsSelection, a
+    DataFrameInplodeColumn or a reader); without such a step every input column reaches the output
+
+    :param pipeline: The pipeline
+    :type pipeline: Pipeline
+    :return: The sorted list of input columns, None if all of them are needed
+    """
+    needed: Set[str] = set()
+    produced: Set[str] = set()
+    renamed: Dict[str, str] = {}
+    for _, step in pipeline.steps:
+        if step is None or step == "passthrough":
+            continue
+        reads = None if isinstance(step, (DataFrameToCsv, DataFrameToParquet)) else step_reads(step)
+        if reads is None:
+            return None
+        needed |= _input_columns(reads, produced, renamed)
+        if isinstance(step, PROJECTION_STEPS):
+            return sorted(needed)
+        if isinstance(step, DataFrameColumnsRename):
+            _track_rename(step, produced, renamed)
+        else:
+            _track_writes(step, produced, renamed)
+
+    return None
+
+
+def is_row_wise(step: Any) -> bool:
+    """
+    > Check that a step computes each row independently of the other rows, so it gives the same
+    result on any subset of the rows
+
+    :param step: The pipeline step
+    :type step: Any
+    :return: True if the step is row-wise
+    """
+    if step is None or step == "passthrough":
+        return True
+
+    return not isinstance(step, BARRIER_STEPS) and step_reads(step) is not None
+
+
+def query_predicate(step: DataFrameQueryFilter) -> Optional[Tuple[str, str, Any]]:
+    """
+    > Turn the query of a DataFrameQueryFilter into a simple predicate, if it compares its column to a
+    literal, e.g. `> 10` or `== 'en'`
+
+    :param step: The query filter
+    :type step: DataFrameQueryFilter
+    :return: A (column, operator, value) tuple, None if the query is not simple
+    """
+    match = SIMPLE_QUERY.match(step.query)
+    if match is None:
+        return None
+    try:
+        value = ast.literal_eval(match.group(2))
+    except (ValueError, SyntaxError):
+        return None
+    if not isinstance(value, (bool, int, float, str)):
+        return None
+
+    return step.text_column, match.group(1), value
+
+
+def reader_filters(pipeline: Pipeline) -> List[Tuple[str, str, Any]]:
+    """
+    > Find the simple predicates that can be applied by the reader, before the rows are converted to
+    a dataframe and sent to the workers. Only the filters at the start of the pipeline qualify, where
+    the columns are still the input columns; the filters stay in the pipeline
+
+    :param pipeline: The pipeline
+    :type pipeline: Pipeline
+    :return: A list of (column, operator, value) tuples, the operator "notnull" has no value
+    """
+    filters = []
+    for _, step in pipeline.steps:
+        if step is None or step == "passthrough" or isinstance(step, (DataFrameColumnsSelection, DataFrameColumnsDrop)):
+            continue
+        if isinstance(step, DataFrameDropEmptyRows):
+            filters.append((step.text_column, "notnull", None))
+            continue
+        if isinstance(step, DataFrameQueryFilter):
+            predicate = query_predicate(step)
+            if predicate is not None:
+                filters.append(predicate)
+                continue
+        break
+
+    return filters
+
+
+def _step_columns(step: Any) -> Tuple[Set[str], Set[str], Set[str], Optional[Set[str]]]:
+    """
+    > Find how a step uses the columns, for the dependency graph
+
+    :param step: The pipeline step
+    :type step: Any
+    :return: The columns it reads, writes and removes, and the columns it keeps (None if it keeps all)
+    """
+    if step is None or step == "passthrough":
+        return set(), set(), set(), None
+    if isinstance(step, DataFrameColumnsRename):
+        return set(step.columns_mapping), set(step.columns_mapping.values()), set(step.columns_mapping), None
+    if isinstance(step, DataFrameColumnsDrop):
+        return set(), set(), set(step.columns), None
+    if isinstance(step, DataFrameColumnsSelection):
+        return set(step.columns), set(), set(), set(step.columns)
+
+    return step_reads(step) or set(), step_writes(step), set(), None
+
+
+def depends_on(step: Any, previous: Any) -> bool:
+    """
+    > Check if a step must stay after a previous step: when one of them is not row-wise, when both are
+    filters, when they touch the same column and one of them writes or removes it, or when a column
+    selection would remove a column used by the other one
+
+    :param step: The later step
+    :type step: Any
+    :param previous: The earlier step
+    :type previous: Any
+    :return: True if the order of the two steps matters
+    """
+    if not is_row_wise(step) or not is_row_wise(previous):
+        return True
+    if isinstance(step, FILTER_STEPS) and isinstance(previous, FILTER_STEPS):
+        return True
+    reads, writes, removes, keeps = _step_columns(step)
+    previous_reads, previous_writes, previous_removes, previous_keeps = _step_columns(previous)
+    if previous_writes & (reads | writes) or previous_reads & writes:
+        return True
+    if previous_removes & (reads | writes) or removes & (previous_reads | previous_writes):
+        return True
+    if previous_keeps is not None and (reads | writes) - previous_keeps:
+        return True
+    if keeps is not None and (previous_reads | previous_writes) - keeps:
+        return True
+
+    return False
+
+
+def dependency_graph(pipeline: Pipeline) -> Dict[int, Set[int]]:
+    """
+    > Build the dependency graph of the pipeline steps from the columns they read and write
+
+    :param pipeline: The pipeline
+    :type pipeline: Pipeline
+    :return: For the index of each step, the indices of the earlier steps it depends on
+    """
+    steps = [step for _, step in pipeline.steps]
+
+    return {
+        index: {previous for previous in range(index) if depends_on(step, steps[previous])}
+        for index, step in enumerate(steps)
+    }
+
+
+def _step_rank(step: Any) -> int:
+    """
+    > The priority of a step when several can run next: filters first so the next steps see fewer rows,
+    then the steps removing columns, then the others
+    """
+    if isinstance(step, FILTER_STEPS):
+        return 0
+    if isinstance(step, (DataFrameColumnsSelection, DataFrameColumnsDrop)):
+        return 1
+
+    return 2
+
+
+def reorder_steps(pipeline: Pipeline) -> Pipeline:
+    """
+    > Reorder the steps along the dependency graph: among the steps whose dependencies already ran,
+    the filters go first, then the steps removing columns, then the others in their original order,
+    keeping a text step right after the one it can be fused with. Only the filters, the column
+    drops and selections and the in-place text steps can move ahead, and none of them creates a
+    column, so the output columns come in the same order as with the original pipeline
+
+    :param pipeline: The pipeline
+    :type pipeline: Pipeline
+    :return: A new pipeline with the same steps, reordered
+    """
+    steps = [step for _, step in pipeline.steps]
+    graph = dependency_graph(pipeline)
+    done: Set[int] = set()
+    order: List[int] = []
+
+    def priority(index: int) -> Tuple[int, bool, int]:
+        fusable = bool(order) and _can_fuse(steps[index], steps[order[-1]])
+        return _step_rank(steps[index]), not fusable, index
+
+    while len(order) < len(steps):
+        ready = [index for index in graph if index not in done and graph[index] <= done]
+        index = min(ready, key=priority)
+        order.append(index)
+        done.add(index)
+
+    return Pipeline([pipeline.steps[index] for index in order], memory=pipeline.memory, verbose=pipeline.verbose)
+
+
+def _column_fate(steps: List[Tuple[str, Any]], index: int, column: str) -> Optional[str]:
+    """
+    > Find what happens to a column written by a step: "overwritten" or "removed" (dropped or left out
+    of a column selection) by a later step before any step reads it, None if it is read or reaches
+    the end of the pipeline
+    """
+    for _, later in steps[index + 1 :]:
+        if later is None or later == "passthrough":
+            continue
+        later_reads, later_writes, later_removes, later_keeps = _step_columns(later)
+        if not is_row_wise(later) or column in later_reads:
+            return None
+        if column in later_writes:
+            return "overwritten"
+        if column in later_removes or (later_keeps is not None and column not in later_keeps):
+            return "removed"
+
+    return None
+
+
+def _dead_columns(steps: List[Tuple[str, Any]], index: int) -> Optional[Dict[str, str]]:
+    """
+    > Check if the columns written by a step are never used: each of them is overwritten, dropped or
+    left out of a column selection before any later step reads it, and before the end of the pipeline
+
+    :return: The fate of each column written by the step, None if the step is not dead
+    """
+    step = steps[index][1]
+    if step is None or step == "passthrough" or isinstance(step, FILTER_STEPS + (DataFrameEmptyColumn,)):
+        return None
+    if not is_row_wise(step):
+        return None
+    reads, writes, removes, keeps = _step_columns(step)
+    if not writes or removes or keeps is not None:
+        return None
+    fates = {column: _column_fate(steps, index, column) for column in writes}
+
+    return None if None in fates.values() else fates
+
+
+def remove_dead_steps(pipeline: Pipeline) -> Pipeline:
+    """
+    > Remove the steps whose output is never used, e.g. a column computed and then dropped by a
+    DataFrameColumnsDrop, until no such step is left. A column overwritten by a later step is
+    replaced by a DataFrameEmptyColumn rather than removed, so it keeps its position among the output
+    columns. The DataFrameColumnsDrop steps dropping a column that may no longer exist ignore the
+    missing columns
+
+    :param pipeline: The pipeline
+    :type pipeline: Pipeline
+    :return: A new pipeline without the dead steps
+    """
+    steps = list(pipeline.steps)
+    removed_columns: Set[str] = set()
+    index = len(steps) - 1
+    while index >= 0:
+        fates = _dead_columns(steps, index)
+        if fates is not None:
+            name = steps[index][0]
+            LOGGER.info(f"removing step {name}, its output is never used")
+            removed_columns |= set(fates)
+            steps[index : index + 1] = [
+                (f"{name}:{column}", DataFrameEmptyColumn(column))
+                for column, fate in sorted(fates.items())
+                if fate == "overwritten"
+            ]
+            index = len(steps) - 1
+        else:
+            index -= 1
+    for index, (name, step) in enumerate(steps):
+        if isinstance(step, DataFrameColumnsDrop) and removed_columns & set(step.columns):
+            steps[index] = (name, DataFrameColumnsDrop(step.columns, errors="ignore"))
+
+    return Pipeline(steps, memory=pipeline.memory, verbose=pipeline.verbose)
+
+
+def _can_fuse(step: Any, previous: Any) -> bool:
+    """
+    > Check if a text step can be applied right after the previous one on the same text, that is both
+    declare a `text_method` and the step works in place on the output of the previous one
+    """
+    if not hasattr(step, "text_method") or not hasattr(previous, "text_method"):
+        return False
+
+    return step.text_column == step.new_column == previous.new_column
+
+
+def fuse_text_steps(pipeline: Pipeline) -> Pipeline:
+    """
+    > Fuse the consecutive row-wise text steps working on the same column into a single NlpFusedText
+    step, or a NlpTextNormalizer step when they are all regex cleaning steps, so the column is scanned
+    once instead of once per step
+
+    :param pipeline: The pipeline
+    :type pipeline: Pipeline
+    :return: A new pipeline with the fused steps
+    """
+    groups: List[List[Tuple[str, Any]]] = []
+    for name, step in pipeline.steps:
+        if groups and _can_fuse(step, groups[-1][-1][1]):
+            groups[-1].append((name, step))
+        else:
+            groups.append([(name, step)])
+    steps = []
+    for group in groups:
+        if len(group) == 1:
+            steps.append(group[0])
+            continue
+        first, last = group[0][1], group[-1][1]
+        operators = [step for _, step in group]
+        if all(type(operator) in NORMALIZER_STEPS for operator in operators):
+            normalizer_steps = [NORMALIZER_STEPS[type(operator)] for operator in operators]
+            fused = NlpTextNormalizer(first.text_column, last.new_column, steps=normalizer_steps)
+        else:
+            fused = NlpFusedText(first.text_column, operators, new_column=last.new_column)
+        steps.append(("+".join(name for name, _ in group), fused))
+
+    return Pipeline(steps, memory=pipeline.memory, verbose=pipeline.verbose)
+
+
+def optimize_pipeline(pipeline: Pipeline) -> Pipeline:
+    """
+    > Plan the pipeline: remove the steps whose output is never used, reorder the independent steps so
+    the filters run as early as possible, and fuse the consecutive text steps. The steps themselves
+    are shared with the original pipeline, which is left untouched. The output has the same rows and
+    columns, in the same order, as the output of the original pipeline. The dtypes can differ: a step
+    running after a filter moved ahead of it no longer sees the dropped rows, e.g. a text length
+    stays int64 instead of being promoted to float64 by the missing texts of the dropped rows
+
+    :param pipeline: The pipeline
+    :type pipeline: Pipeline
+    :return: The optimized pipeline
+    """
+    return fuse_text_steps(reorder_steps(remove_dead_steps(pipeline)))
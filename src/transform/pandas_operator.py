@@ -3,6 +3,46 @@ from typing import List, Dict, Any
 from sklearn.base import BaseEstimator
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.transform import data_io
+
+
+# a run of characters that are not whitespace for Python's `\s`, in RE2 syntax where `\s` is ASCII only
+ARROW_WORD = r"[^\s\p{Z}\x0b\x1c-\x1f\x85]+"
+
+
+def _arrow_strings(series: pd.Series) -> pa.Array:
+    """
+    > Convert a text column to an Arrow string array, so the Arrow compute kernels can run on it
+    without a Python call per row. Missing values become nulls, and so do the values that are not
+    strings, which the pandas string methods turn into NaN
+
+    :param series: The text column
+    :type series: pd.Series
+    :return: The Arrow array
+    """
+    if pd.api.types.infer_dtype(series, skipna=True) not in ("string", "empty"):
+        series = series.where(series.map(lambda value: isinstance(value, str)))
+
+    return pa.array(series, type=pa.large_string(), from_pandas=True)
+
+
+def _arrow_to_series(array: pa.Array, index: pd.Index) -> pd.Series:
+    """
+    > Convert the result of an Arrow compute kernel back to a column aligned with the dataframe
+
+    :param array: The result of the kernel
+    :type array: pa.Array
+    :param index: The index of the dataframe
+    :type index: pd.Index
+    :return: The column
+    """
+    series = array.to_pandas()
+    series.index = index
+
+    return series
 
 
 class DataFrameReadCsv(BaseEstimator):
@@ -16,6 +56,18 @@ class DataFrameReadCsv(BaseEstimator):
         return pd.read_csv(self.path)
 
 
+class DataFrameReadParquet(BaseEstimator):
+    def __init__(self, path: str, columns: List[str] = None) -> None:
+        self.path = path
+        self.columns = columns
+
+    def fit(self, x: Any, y: Any = None) -> __qualname__:
+        return self
+
+    def transform(self, x: Any) -> pd.DataFrame:
+        return pd.concat(data_io.read_data(self.path, columns=self.columns))
+
+
 class DataFrameColumnsSelection(BaseEstimator):
     def __init__(self, columns: List[str]) -> None:
         self.columns = columns
@@ -28,14 +80,15 @@ class DataFrameColumnsSelection(BaseEstimator):
 
 
 class DataFrameColumnsDrop(BaseEstimator):
-    def __init__(self, columns: List[str]) -> None:
+    def __init__(self, columns: List[str], errors: str = "raise") -> None:
         self.columns = columns
+        self.errors = errors
 
     def fit(self, x: Any, y: Any = None) -> __qualname__:
         return self
 
     def transform(self, x: Any) -> pd.DataFrame:
-        return x.drop(columns=self.columns)
+        return x.drop(columns=self.columns, errors=self.errors)
 
 
 class DataFrameColumnsRename(BaseEstimator):
@@ -49,21 +102,40 @@ class DataFrameColumnsRename(BaseEstimator):
         return x.rename(columns=self.columns_mapping)
 
 
+class DataFrameEmptyColumn(BaseEstimator):
+    def __init__(self, new_column: str) -> None:
+        self.new_column = new_column
+
+    def fit(self, x: Any, y: Any = None) -> __qualname__:
+        return self
+
+    def transform(self, x: Any) -> pd.DataFrame:
+        x[self.new_column] = None
+
+        return x
+
+
 class DataFrameTextFormat(BaseEstimator):
-    def __init__(self, text_column: str, new_column: str = None, format: str = "lower") -> None:
+    def __init__(self, text_column: str, new_column: str = None, format: str = "lower", engine: str = "pandas") -> None:
         assert format.lower() in ["lower", "upper", "capitalize"]
+        assert engine in ["pandas", "pyarrow"]
         self.format = format.lower()
         self.text_column = text_column
         if new_column is None:
             self.new_column = text_column
         else:
             self.new_column = new_column
+        self.engine = engine
 
     def fit(self, x: Any, y: Any = None) -> __qualname__:
         return self
 
     def transform(self, x: Any) -> pd.DataFrame:
-        x[self.new_column] = getattr(x[self.text_column].str, self.format)()
+        if self.engine == "pyarrow":
+            kernel = getattr(pc, f"utf8_{self.format}")
+            x[self.new_column] = _arrow_to_series(kernel(_arrow_strings(x[self.text_column])), x.index)
+        else:
+            x[self.new_column] = getattr(x[self.text_column].str, self.format)()
 
         return x
 
@@ -80,35 +152,47 @@ class DataFrameDropEmptyRows(BaseEstimator):
 
 
 class DataFrameTextLength(BaseEstimator):
-    def __init__(self, text_column: str, new_column: str = None) -> None:
+    def __init__(self, text_column: str, new_column: str = None, engine: str = "pandas") -> None:
+        assert engine in ["pandas", "pyarrow"]
         self.text_column = text_column
         if new_column is None:
             self.new_column = text_column
         else:
             self.new_column = new_column
+        self.engine = engine
 
     def fit(self, x: Any, y: Any = None) -> __qualname__:
         return self
 
     def transform(self, x: Any) -> pd.DataFrame:
-        x[self.new_column] = x[self.text_column].str.len()
+        if self.engine == "pyarrow":
+            x[self.new_column] = _arrow_to_series(pc.utf8_length(_arrow_strings(x[self.text_column])), x.index)
+        else:
+            x[self.new_column] = x[self.text_column].str.len()
 
         return x
 
 
 class DataFrameTextNumberWords(BaseEstimator):
-    def __init__(self, text_column: str, new_column: str = None) -> None:
+    def __init__(self, text_column: str, new_column: str = None, engine: str = "pandas") -> None:
+        assert engine in ["pandas", "pyarrow"]
         self.text_column = text_column
         if new_column is None:
             self.new_column = text_column
         else:
             self.new_column = new_column
+        self.engine = engine
 
     def fit(self, x: Any, y: Any = None) -> __qualname__:
         return self
 
     def transform(self, x: Any) -> pd.DataFrame:
-        x[self.new_column] = x[self.text_column].str.split().str.len()
+        # count the runs of non-space characters instead of splitting, no list of words is allocated
+        if self.engine == "pyarrow":
+            words = pc.count_substring_regex(_arrow_strings(x[self.text_column]), ARROW_WORD)
+            x[self.new_column] = _arrow_to_series(words, x.index)
+        else:
+            x[self.new_column] = x[self.text_column].str.count(r"\S+")
 
         return x
 
@@ -182,3 +266,16 @@ class DataFrameToCsv(BaseEstimator):
         x.to_csv(self.output_path, index=False)
 
         return x
+
+
+class DataFrameToParquet(BaseEstimator):
+    def __init__(self, output_path: str) -> None:
+        self.output_path = output_path
+
+    def fit(self, x, y=None) -> __qualname__:
+        return self
+
+    def transform(self, x) -> pd.DataFrame:
+        x.to_parquet(self.output_path, index=False)
+
+        return x
@@ -1,5 +1,19 @@
-from typing import Union
+from collections import deque
+from functools import partial
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import multiprocessing as mp
+from multiprocessing.pool import AsyncResult, ExceptionWithTraceback
+import os
+import queue
+import sys
+import threading
+import time
+
+try:
+    from multiprocessing import resource_tracker
+except ImportError:  # Python 3.7, where shared_memory=True is refused
+    resource_tracker = None
 
 import pandas as pd
 import numpy as np
@@ -9,13 +23,293 @@ from sklearn.pipeline import Pipeline
 
 from src.fixtures.data import FIXTURE_DF
 from src.settings import DEBUG, LOGGER
+from src.transform import data_io, optimizer
+from src.transform.cache import StepCache, spacy_steps
+from src.transform.checkpoint import ChunkCheckpoint, chunk_offsets, run_fingerprint
+from src.transform.shared import from_shared, release_shared, to_shared
 from src.transform.pandas_operator import *
 from src.transform.nlp_operator import *
 from src.utils.decorator import timeit
+from src.utils.profiler import PipelineProfiler
+
+
+_WORKER_TRANSFORM: Optional["PipelineTransform"] = None
+DEFAULT_FIT_SAMPLE = 1000
+
+
+def _init_worker(transform: "PipelineTransform") -> None:
+    """
+    > Store the transform in the worker process, so the pipeline is only shipped once per worker and
+    stays in memory between chunks
+
+    :param transform: The PipelineTransform the worker will run
+    :type transform: PipelineTransform
+    """
+    global _WORKER_TRANSFORM
+    _WORKER_TRANSFORM = transform
+    if transform.profiler is not None:
+        # a forked worker starts with a copy of the stats of the main process
+        transform.profiler.reset()
+
+
+def _process_worker(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    > Process a split of the dataframe with the transform stored in the worker process
+
+    :param df: The dataframe to be processed
+    :type df: pd.DataFrame
+    :return: A dataframe
+    """
+    return _WORKER_TRANSFORM.process(df)
+
+
+def _process_shared_worker(
+    task: Tuple[str, int, int, int, pd.Index]
+) -> Tuple[Optional[Tuple[str, int]], Union[pd.Index, pd.DataFrame, "_Raise"]]:
+    """
+    > Process rows of a dataframe held in shared memory with the transform stored in the worker process,
+    and write the result in a new shared memory block. An exception is sent back instead of raised, so
+    the other parts of the chunk still complete and the main process can free their blocks
+
+    :param task: The name and size of the block, the offset and number of rows to process, and their
+    index
+    :type task: Tuple[str, int, int, int, pd.Index]
+    :return: The name and size of the result block with the index of the result, or no block and the
+    result itself when it cannot be shared, or no block and the exception raised
+    """
+    name, size, offset, length, index = task
+    try:
+        df = _WORKER_TRANSFORM.process(from_shared(name, size, index, offset, length))
+    except Exception as error:
+        return None, _Raise(ExceptionWithTraceback(error, error.__traceback__))
+    shared = to_shared(df)
+    if shared is None:
+        return None, df
+
+    return shared, df.index
+
+
+def _profiled_worker(worker: Callable[[Any], Any], argument: Any) -> Tuple[Any, Dict[str, Dict[str, float]]]:
+    """
+    > Run a worker function and send back the stats its steps recorded in the worker process
+
+    :param worker: The worker function
+    :type worker: Callable[[Any], Any]
+    :param argument: The argument of the worker function
+    :type argument: Any
+    :return: The result of the worker function and the stats per step
+    """
+    result = worker(argument)
+
+    return result, _WORKER_TRANSFORM.profiler.pop()
+
+
+def _scheduled_worker(task: Tuple[int, Callable[[Any], Any], Any]) -> Tuple[int, int, float, Any]:
+    """
+    > Run a task of the scheduler and time it
+
+    :param task: The position of the task, the worker function and its argument
+    :type task: Tuple[int, Callable[[Any], Any], Any]
+    :return: The position of the task, the pid of the worker, the time spent and the result
+    """
+    position, function, argument = task
+    start = time.perf_counter()
+    result = function(argument)
+
+    return position, os.getpid(), time.perf_counter() - start, result
+
+
+class _ScheduledResult:
+    """It collects the tasks of a chunk completed in any order, and puts them back in order."""
+
+    def __init__(self, results: Iterator[Tuple[int, int, float, Any]], n_tasks: int) -> None:
+        self.results = results
+        self.n_tasks = n_tasks
+        self.start = time.perf_counter()
+        self.busy: Dict[int, float] = {}
+        self.tasks: Dict[int, int] = {}
+
+    def get(self) -> List[Any]:
+        ordered = [None] * self.n_tasks
+        for position, pid, elapsed, result in self.results:
+            ordered[position] = result
+            self.busy[pid] = self.busy.get(pid, 0.0) + elapsed
+            self.tasks[pid] = self.tasks.get(pid, 0) + 1
+        if DEBUG:
+            wall = time.perf_counter() - self.start
+            for pid, utilization in self.utilization(wall).items():
+                LOGGER.info(f"worker {pid}: {self.tasks[pid]} tasks, {utilization:.0%} busy over {wall:.2f}s")
+
+        return ordered
+
+    def utilization(self, wall: float) -> Dict[int, float]:
+        """
+        > The share of the wall time each worker spent on the tasks of the chunk
+
+        :param wall: The wall time of the chunk, from dispatch to the last result
+        :type wall: float
+        :return: A dict of worker pid to utilization between 0 and 1
+        """
+        return {pid: busy / wall if wall > 0 else 0.0 for pid, busy in self.busy.items()}
+
+
+class _ProfiledResult:
+    """It waits for the parts of a chunk and adds the stats recorded by the workers to the profiler."""
+
+    def __init__(self, result: Union[AsyncResult, _ScheduledResult], profiler: PipelineProfiler) -> None:
+        self.result = result
+        self.profiler = profiler
+
+    def get(self) -> List[Any]:
+        parts = []
+        for part, stats in self.result.get():
+            self.profiler.merge(stats)
+            parts.append(part)
+
+        return parts
+
+
+class _SharedResult:
+    """It waits for the parts of a chunk sent through shared memory, and frees the blocks once read."""
+
+    def __init__(self, result: Union[AsyncResult, _ScheduledResult, _ProfiledResult], name: str) -> None:
+        self.result = result
+        self.name = name
+
+    def get(self) -> List[pd.DataFrame]:
+        try:
+            parts = self.result.get()
+        finally:
+            release_shared(self.name)
+        errors = [result for _, result in parts if isinstance(result, _Raise)]
+        if errors:
+            _release_parts(parts)
+            raise errors[0].error
+        dfs = []
+        try:
+            for shared, result in parts:
+                dfs.append(result if shared is None else from_shared(*shared, result, release=True))
+        except BaseException:
+            _release_parts(parts[len(dfs) + 1 :])
+            raise
+
+        return dfs
+
+
+def _release_parts(parts: List[Tuple[Optional[Tuple[str, int]], Any]]) -> None:
+    """
+    > Free the result blocks of parts that will not be read
+
+    :param parts: The parts sent back by `_process_shared_worker`
+    :type parts: List[Tuple[Optional[Tuple[str, int]], Any]]
+    """
+    for shared, _ in parts:
+        if shared is not None:
+            release_shared(shared[0])
+
+
+class _Raise:
+    """It carries an exception from the producer thread of `_prefetch`, or from a worker, to the consumer."""
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+_END = object()
+
+
+def _put(items: queue.Queue, stop: threading.Event, item: Any) -> bool:
+    """
+    > Put the item in the queue, waiting for a free slot until the consumer stops
+
+    :param items: The bounded queue
+    :type items: queue.Queue
+    :param stop: The event set when the consumer stops
+    :type stop: threading.Event
+    :param item: The item
+    :type item: Any
+    :return: False if the consumer stopped before the item could be queued
+    """
+    while not stop.is_set():
+        try:
+            items.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+
+    return False
+
+
+def _produce(iterable: Iterable, items: queue.Queue, stop: threading.Event) -> None:
+    """
+    > The body of the producer thread of `_prefetch`: it queues the items of the iterable followed by
+    `_END`, or the exception raised by the iterable
+
+    :param iterable: The items to produce
+    :type iterable: Iterable
+    :param items: The bounded queue
+    :type items: queue.Queue
+    :param stop: The event set when the consumer stops
+    :type stop: threading.Event
+    """
+    iterator = iter(iterable)
+    try:
+        for item in iterator:
+            if not _put(items, stop, item):
+                return
+        _put(items, stop, _END)
+    except BaseException as error:
+        _put(items, stop, _Raise(error))
+    finally:
+        if hasattr(iterator, "close"):
+            iterator.close()
+
+
+def _prefetch(iterable: Iterable, depth: int) -> Iterator:
+    """
+    > Iterate over the iterable in a background thread, keeping at most `depth` items ready in a
+    bounded queue, so producing the next items overlaps with consuming the current one. Exceptions
+    raised by the iterable are raised again in the consumer
+
+    :param iterable: The items to produce
+    :type iterable: Iterable
+    :param depth: The maximum number of items waiting in the queue
+    :type depth: int
+    :return: An iterator over the same items
+    """
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    thread = threading.Thread(target=_produce, args=(iterable, items, stop), daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _END:
+                return
+            if isinstance(item, _Raise):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        thread.join()
 
 
 class PipelineTransform:
-    def __init__(self, pipeline: Pipeline, njobs: int = 1) -> None:
+    def __init__(
+        self,
+        pipeline: Pipeline,
+        njobs: int = 1,
+        fit_once: bool = False,
+        fit_sample: int = None,
+        queue_depth: int = 2,
+        optimize: bool = False,
+        cache: StepCache = None,
+        checkpoint: ChunkCheckpoint = None,
+        shared_memory: bool = False,
+        task_size: int = None,
+        balance_column: str = None,
+        profile: bool = False,
+    ) -> None:
         """
         > This function takes a pipeline and a number of jobs as input and sets the number of jobs to the
         number of jobs inputted if the number of jobs is greater than 0, otherwise it sets the number of
@@ -25,9 +319,72 @@ class PipelineTransform:
         :type pipeline: Pipeline
         :param njobs: number of jobs to run in parallel, defaults to 1
         :type njobs: int (optional)
+        :param fit_once: fit the pipeline once in the main process and only call `transform` in the
+        workers, instead of calling `fit_transform` on every split, defaults to False
+        :type fit_once: bool (optional)
+        :param fit_sample: number of rows of the first chunk used to fit the pipeline when fit_once is
+        set. If None, the first DEFAULT_FIT_SAMPLE rows are used
+        :type fit_sample: int (optional)
+        :param queue_depth: number of chunks read ahead, processed concurrently and waiting to be
+        written. It bounds the memory used by the chunked path, 0 processes the chunks one by one,
+        defaults to 2
+        :type queue_depth: int (optional)
+        :param optimize: plan the pipeline from the columns its steps read and write: remove the steps
+        whose output is never used, move the filters as early as possible and fuse consecutive text
+        steps. The output columns keep the order of the original pipeline, their dtypes can differ when
+        a filter moved ahead drops the missing values that promoted them, defaults to False
+        :type optimize: bool (optional)
+        :param cache: store the output of every step on disk, keyed by the content of its input and the
+        parameters of the step, so a run after changing a step restarts from the last unchanged one. If
+        None, nothing is cached
+        :type cache: StepCache (optional)
+        :param checkpoint: persist every transformed chunk with a manifest of the input offsets done, so
+        a run restarted after a crash skips the chunks already transformed. If None, nothing is persisted
+        :type checkpoint: ChunkCheckpoint (optional)
+        :param shared_memory: send the chunks to the workers and get the results back as Arrow data in
+        shared memory, instead of pickling every part. Frames with nested or non-Arrow columns (lists,
+        dicts, spaCy docs) are still pickled. Needs Python 3.8 or later, defaults to False
+        :type shared_memory: bool (optional)
+        :param task_size: split every chunk into tasks of about task_size rows, handed out to the workers
+        as soon as they are free, instead of one part per worker. Small tasks keep every worker busy
+        when some rows are much slower than others. If None, the chunk is split into njobs parts
+        :type task_size: int (optional)
+        :param balance_column: size the parts by the total length of the texts of this column instead
+        of their number of rows, so parts with long texts get fewer rows
+        :type balance_column: str (optional)
+        :param profile: record the wall time, CPU time, rows in and out and memory delta of every step,
+        summed over the chunks and workers of a run, in `profiler`. The stats are logged at the end of
+        the run and can be exported with `profiler.to_json` or `profiler.to_table`, defaults to False
+        :type profile: bool (optional)
         """
-        self.pipeline = pipeline
+        assert not shared_memory or sys.version_info >= (3, 8), "shared_memory needs Python 3.8 or later"
+        self.pipeline = optimizer.optimize_pipeline(pipeline) if optimize else pipeline
         self.njobs = self.find_optimal_jobs(njobs)
+        self.fit_once = fit_once
+        self.fit_sample = fit_sample
+        self.fitted = False
+        self.queue_depth = queue_depth
+        self.cache = cache
+        self.checkpoint = checkpoint
+        self.shared_memory = shared_memory
+        self.task_size = task_size
+        self.balance_column = balance_column
+        self.profiler = PipelineProfiler() if profile else None
+        self.pool: Optional[mp.Pool] = None
+
+    def __enter__(self) -> "PipelineTransform":
+        self.open()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["pool"] = None
+
+        return state
 
     @staticmethod
     def find_optimal_jobs(njobs: int) -> int:
@@ -55,11 +412,67 @@ class PipelineTransform:
 
         :return: A Pool object.
         """
-        return mp.Pool(self.njobs)
+        if self.shared_memory:
+            # the workers must share the tracker of the main process, otherwise each worker tracks the
+            # blocks it creates and unlinks them when it exits, before the main process has read them
+            resource_tracker.ensure_running()
+
+        return mp.Pool(self.njobs, initializer=_init_worker, initargs=(self,))
+
+    def open(self) -> None:
+        """
+        > Start the pool of workers if it is not already running. The pool is kept alive until `close`
+        is called, so every chunk transformed in between reuses the same workers
+        """
+        if self.pool is None:
+            if mp.get_start_method() == "fork":
+                self.preload()
+            self.pool = self._pool()
+
+    def preload(self) -> None:
+        """
+        > Load the spaCy models used by the pipeline in the main process, including the ones of the
+        operators wrapped by another step. With a fork-based pool, the workers then share the model pages
+        copy-on-write instead of each loading their own copy
+        """
+        for _, step in self.pipeline.steps:
+            for operator in spacy_steps(step):
+                if operator.doc_column is None:
+                    operator.preload()
+
+    def close(self) -> None:
+        """
+        > Stop the pool of workers and wait for them to exit
+        """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def fit(self, df: pd.DataFrame) -> "PipelineTransform":
+        """
+        > Fit the pipeline once in the main process, on the first `fit_sample` rows of the dataframe, or
+        the first DEFAULT_FIT_SAMPLE rows without a fit_sample. A running pool is restarted so the workers
+        receive the fitted pipeline
+
+        :param df: The dataframe used to fit the pipeline
+        :type df: pd.DataFrame
+        :return: The PipelineTransform itself
+        """
+        sample = df.head(DEFAULT_FIT_SAMPLE if self.fit_sample is None else self.fit_sample)
+        self.pipeline.fit(sample.copy())
+        self.fitted = True
+        if self.pool is not None:
+            self.close()
+            self.open()
+
+        return self
 
     def process(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        > The function takes a pipeline and a dataframe as input, and returns a dataframe as output
+        > The function takes a pipeline and a dataframe as input, and returns a dataframe as output.
+        When the pipeline has been fitted once, only `transform` is called. With a cache, the steps
+        whose output is already cached are skipped. With a profiler, every step is recorded
 
         :param pipeline: Pipeline
         :type pipeline: Pipeline
@@ -67,6 +480,13 @@ class PipelineTransform:
         :type df: pd.DataFrame
         :return: A dataframe with the columns that were selected by the pipeline.
         """
+        if self.cache is not None:
+            return self.cache.process(self.pipeline, df, fit=not self.fitted, profiler=self.profiler)
+        if self.profiler is not None:
+            return self.profiler.process(self.pipeline, df, fit=not self.fitted)
+        if self.fitted:
+            return self.pipeline.transform(df)
+
         return self.pipeline.fit_transform(df)
 
     def mp_process(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -78,29 +498,236 @@ class PipelineTransform:
         :type df: pd.DataFrame
         :return: A dataframe
         """
-        df_splitted = np.array_split(df, self.njobs)
-        pool = self._pool()
-        datas = pool.map(self.process, df_splitted)
-        pool.close()
+        return pd.concat(self.mp_process_async(df).get())
+
+    def split_bounds(self, df: pd.DataFrame) -> List[Tuple[int, int]]:
+        """
+        > It computes the parts the dataframe is split into: njobs parts, or parts of about task_size
+        rows when task_size is set. With a balance_column, the parts hold the same total text length
+        rather than the same number of rows
+
+        :param df: pd.DataFrame
+        :type df: pd.DataFrame
+        :return: The offset and number of rows of every part
+        """
+        n_parts = self.njobs if self.task_size is None else max(1, -(-len(df) // self.task_size))
+        if self.balance_column is None:
+            # same part sizes as np.array_split
+            size, extra = divmod(len(df), n_parts)
+            lengths = [size + (part < extra) for part in range(n_parts)]
+            offsets = np.cumsum([0] + lengths[:-1])
+        else:
+            # every row weighs its text length plus one, a part ends with the row reaching its share
+            cumulative = np.cumsum(df[self.balance_column].astype(str).str.len().to_numpy() + 1)
+            targets = cumulative[-1] * np.arange(1, n_parts) / n_parts if len(df) else []
+            cuts = np.unique(np.concatenate([[0], np.searchsorted(cumulative, targets) + 1, [len(df)]]))
+            offsets, lengths = (cuts[:-1], np.diff(cuts)) if len(df) else ([0], [0])
+
+        return [(int(offset), int(length)) for offset, length in zip(offsets, lengths)]
+
+    def mp_process_async(
+        self, df: pd.DataFrame
+    ) -> Union[AsyncResult, _ScheduledResult, _ProfiledResult, _SharedResult]:
+        """
+        > It splits the dataframe into parts and sends them to the pool of workers without waiting for
+        the result, so several chunks can be processed at the same time. With a task_size or a
+        balance_column, the parts are handed out to the workers as they become free and put back in
+        order. With shared_memory, the dataframe is written once in shared memory and the workers only
+        receive the offsets of their part
+
+        :param df: pd.DataFrame
+        :type df: pd.DataFrame
+        :return: The pending list of processed parts
+        """
+        bounds = self.split_bounds(df)
+        shared = to_shared(df) if self.shared_memory else None
+        if shared is not None:
+            worker = _process_shared_worker
+            parts = [(*shared, offset, length, df.index[offset : offset + length]) for offset, length in bounds]
+        else:
+            worker = _process_worker
+            parts = [df.iloc[offset : offset + length] for offset, length in bounds]
+        if self.profiler is not None:
+            worker = partial(_profiled_worker, worker)
+        if self.task_size is None and self.balance_column is None:
+            result = self.pool.map_async(worker, parts)
+        else:
+            tasks = [(position, worker, part) for position, part in enumerate(parts)]
+            result = _ScheduledResult(self.pool.imap_unordered(_scheduled_worker, tasks), len(tasks))
+        if self.profiler is not None:
+            result = _ProfiledResult(result, self.profiler)
+        if shared is not None:
+            return _SharedResult(result, shared[0])
 
-        return pd.concat(datas)
+        return result
 
     @staticmethod
-    def read_data(input_file: str, chunksize: int) -> List[pd.DataFrame]:
+    def read_data(
+        input_file: str, chunksize: int, columns: List[str] = None, filters: List[Tuple[str, str, Any]] = None
+    ) -> Iterable[pd.DataFrame]:
         """
-        > Reads a CSV file into a Pandas DataFrame, either as a single DataFrame or as a list of
-        DataFrames, depending on the value of the chunksize parameter
+        > Reads a CSV, Parquet or Arrow file into a Pandas DataFrame, either as a single DataFrame or as
+        an iterator of DataFrames, depending on the value of the chunksize parameter
 
         :param input_file: The path to the file you want to read
         :type input_file: str
         :param chunksize: The number of rows to read in at a time. If None, then all rows are read.
         :type chunksize: int
-        :return: A list of dataframes.
+        :param columns: The columns to read, if None all the columns are read
+        :type columns: List[str]
+        :param filters: The (column, operator, value) predicates the rows must match
+        :type filters: List[Tuple[str, str, Any]]
+        :return: An iterable of dataframes.
         """
-        if chunksize is None:
-            return [pd.read_csv(input_file, encoding="latin1")]
-        else:
-            return pd.read_csv(input_file, encoding="latin1", chunksize=chunksize)
+        return data_io.read_data(input_file, chunksize, columns, filters)
+
+    def input_columns(self) -> Optional[List[str]]:
+        """
+        > Find the input columns used by the pipeline, by walking its steps, and the balance_column the
+        chunks are split on
+
+        :return: The list of columns, None if every column is needed
+        """
+        columns = optimizer.required_columns(self.pipeline)
+        if columns is None or self.balance_column is None or self.balance_column in columns:
+            return columns
+
+        return sorted(columns + [self.balance_column])
+
+    def input_filters(self) -> List[Tuple[str, str, Any]]:
+        """
+        > Find the simple predicates at the start of the pipeline, that can be applied while reading
+
+        :return: A list of (column, operator, value) tuples
+        """
+        return optimizer.reader_filters(self.pipeline)
+
+    def iter_transform(self, input: Union[str, pd.DataFrame], chunksize: int = None) -> Iterator[pd.DataFrame]:
+        """
+        > It reads a file or dataframe in chunks, processes each chunk, and yields the transformed chunks
+        in order as soon as they are ready. The next chunks are read in a background thread and
+        processed while the current one is consumed, at most `queue_depth` chunks ahead. Only the
+        input columns used by the pipeline are read and sent to the workers, and the rows dropped by
+        the filters at the start of the pipeline are dropped while reading. With a checkpoint, the
+        chunks done by a previous run of the same job are loaded instead of processed. With profile,
+        the stats of the steps are reset at the start of the run and logged at its end
+
+        :param input: input file to read or input pandas dataframe
+        :type input: Union[str, pd.DataFrame]
+        :param chunksize: how to split dataset into chunks
+        :type chunksize: int
+        :return: An iterator of dataframes
+        """
+        if self.checkpoint is not None:
+            self.checkpoint.start(run_fingerprint(self.pipeline, input, chunksize))
+        if self.profiler is not None:
+            self.profiler.reset()
+        owns_pool = self.pool is None
+        try:
+            pending = deque()
+            for index, chunk_df in enumerate(self._start(self._read_chunks(input, chunksize))):
+                pending.append(self._dispatch(index, chunk_df))
+                if len(pending) > self.queue_depth:
+                    yield self._collect(*pending.popleft())
+            while pending:
+                yield self._collect(*pending.popleft())
+            if self.profiler is not None:
+                LOGGER.info(f"pipeline steps profile:\n{self.profiler.to_table()}")
+        finally:
+            if owns_pool:
+                self.close()
+
+    def _read_chunks(self, input: Union[str, pd.DataFrame], chunksize: Optional[int]) -> Iterable[pd.DataFrame]:
+        """
+        > Read the input in chunks, keeping only the input columns used by the pipeline and the rows
+        kept by the filters at its start
+
+        :param input: input file to read or input pandas dataframe
+        :type input: Union[str, pd.DataFrame]
+        :param chunksize: how to split dataset into chunks
+        :type chunksize: int
+        :return: An iterable of dataframes
+        """
+        columns = self.input_columns()
+        filters = self.input_filters()
+        if isinstance(input, str):
+            return self.read_data(input, chunksize, columns, filters)
+        if columns is not None:
+            input = input[[column for column in input.columns if column in columns]]
+        input = data_io.filter_frame(input, filters)
+        n = 1 if chunksize is None else max(1, len(input) // chunksize)
+
+        return np.array_split(input, n)
+
+    def _start(self, chunks_df: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        > Fit the pipeline on a sample of the first chunk if it has to be fitted once, then start the
+        pool and the reader thread. The pool is forked before the reader thread starts: forking while a
+        thread holds a pandas or pyarrow lock can deadlock the workers
+
+        :param chunks_df: The input chunks
+        :type chunks_df: Iterable[pd.DataFrame]
+        :return: The input chunks, read ahead in the background if queue_depth > 0
+        """
+        chunks_df = iter(chunks_df)
+        first_df = next(chunks_df, None)
+        if first_df is not None:
+            if self.fit_once and not self.fitted:
+                self.fit(first_df)
+            chunks_df = chain([first_df], chunks_df)
+        self.open()
+        if self.queue_depth > 0:
+            chunks_df = _prefetch(chunks_df, self.queue_depth)
+
+        return chunks_df
+
+    def _dispatch(
+        self, index: int, chunk_df: pd.DataFrame
+    ) -> Tuple[int, Optional[list], Union[pd.DataFrame, AsyncResult, _ScheduledResult, _ProfiledResult, _SharedResult]]:
+        """
+        > Load the chunk from the checkpoint, or send it to the workers
+
+        :param index: The position of the chunk in the run
+        :type index: int
+        :param chunk_df: The input chunk
+        :type chunk_df: pd.DataFrame
+        :return: The position and offsets of the chunk, with the transformed chunk or its pending parts
+        """
+        offsets = chunk_offsets(chunk_df)
+        done_df = None if self.checkpoint is None else self.checkpoint.load(index, offsets)
+        if done_df is not None:
+            return index, offsets, done_df
+        if DEBUG:
+            LOGGER.info(f"working on rows {chunk_df.index.min()} to {chunk_df.index.max()}")
+            LOGGER.info(chunk_df.info(memory_usage="deep"))
+
+        return index, offsets, self.mp_process_async(chunk_df)
+
+    def _collect(
+        self,
+        index: int,
+        offsets: Optional[list],
+        result: Union[pd.DataFrame, AsyncResult, _ScheduledResult, _ProfiledResult, _SharedResult],
+    ) -> pd.DataFrame:
+        """
+        > Wait for a chunk sent to the workers and checkpoint it, or return the chunk loaded from the
+        checkpoint
+
+        :param index: The position of the chunk in the run
+        :type index: int
+        :param offsets: The offsets of the input chunk
+        :type offsets: list
+        :param result: The chunk loaded from the checkpoint, or the pending parts of the chunk
+        :type result: Union[pd.DataFrame, AsyncResult, _ScheduledResult, _ProfiledResult, _SharedResult]
+        :return: The transformed chunk
+        """
+        if isinstance(result, pd.DataFrame):
+            return result
+        transformed_df = pd.concat(result.get())
+        if self.checkpoint is not None:
+            self.checkpoint.save(index, offsets, transformed_df)
+
+        return transformed_df
 
     @timeit
     def transform(self, input: Union[str, pd.DataFrame], chunksize: int = None) -> pd.DataFrame:
@@ -113,20 +740,40 @@ class PipelineTransform:
         :type chunksize: int
         :return: A dataframe
         """
-        transformed_dfs: List[pd.DataFrame] = []
-        if isinstance(input, str):
-            chunks_df = self.read_data(input, chunksize)
-        else:
-            n = 1 if chunksize is None else len(input) // chunksize
-            chunks_df = np.array_split(input, n)
-        for chunk_df in chunks_df:
-            if DEBUG:
-                LOGGER.info(f"working on rows {chunk_df.index.min()} to {chunk_df.index.max()}")
-                LOGGER.info(chunk_df.info(memory_usage="deep"))
-            transformed_dfs.append(self.mp_process(chunk_df))
+        transformed_dfs: List[pd.DataFrame] = list(self.iter_transform(input, chunksize))
 
         return pd.concat(transformed_dfs)
 
+    @timeit
+    def transform_to(self, input: Union[str, pd.DataFrame], output_file: str, chunksize: int = None) -> int:
+        """
+        > It transforms the input chunk by chunk and appends every transformed chunk to the output file,
+        so files larger than the memory can be processed. The next chunks are read and transformed
+        while the previous ones are written
+
+        :param input: input file to read or input pandas dataframe
+        :type input: Union[str, pd.DataFrame]
+        :param output_file: The path of the CSV, Parquet or Arrow file to write
+        :type output_file: str
+        :param chunksize: how to split dataset into chunks
+        :type chunksize: int
+        :return: The number of rows written
+        """
+        return self.write_data(self.iter_transform(input, chunksize), output_file)
+
+    @staticmethod
+    def write_data(chunks_df: Iterable[pd.DataFrame], output_file: str) -> int:
+        """
+        > Writes the dataframes one after the other in a CSV, Parquet or Arrow file
+
+        :param chunks_df: The dataframes to write
+        :type chunks_df: Iterable[pd.DataFrame]
+        :param output_file: The path of the file to write
+        :type output_file: str
+        :return: The number of rows written
+        """
+        return data_io.write_data(chunks_df, output_file)
+
 
 if __name__ == "__main__":
     pipeline = Pipeline(
@@ -148,6 +795,6 @@ if __name__ == "__main__":
     )
     set_config(display="diagram")
     print(pipeline)
-    transform = PipelineTransform(pipeline, njobs=1)
-    res = transform.transform(FIXTURE_DF, None)
+    with PipelineTransform(pipeline, njobs=1) as transform:
+        res = transform.transform(FIXTURE_DF, None)
     print(res)
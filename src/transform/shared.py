@@ -0,0 +1,155 @@
+import json
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python 3.7, PipelineTransform refuses shared_memory=True there
+    shared_memory = None
+
+
+def _is_flat(schema: pa.Schema) -> bool:
+    """
+    > Check that no column of the schema is nested. Lists and structs do not come back from Arrow as
+    the Python lists and dicts they were made of, so such frames are pickled instead
+
+    :param schema: The Arrow schema
+    :type schema: pa.Schema
+    :return: True if every column is a scalar column
+    """
+    return not any(pa.types.is_nested(field.type) for field in schema)
+
+
+def _same_dtypes(df: pd.DataFrame, schema: pa.Schema) -> bool:
+    """
+    > Check that the columns come back from Arrow with their dtypes, e.g. an object column of Python
+    ints comes back as int64, so such frames are pickled instead
+
+    :param df: The dataframe
+    :type df: pd.DataFrame
+    :param schema: The Arrow schema of the dataframe
+    :type schema: pa.Schema
+    :return: True if every column keeps its dtype
+    """
+    dtypes = schema.empty_table().to_pandas().dtypes
+
+    return [str(dtype) for dtype in dtypes] == [str(dtype) for dtype in df.dtypes]
+
+
+def _nan_columns(df: pd.DataFrame) -> Optional[List[str]]:
+    """
+    > Find the object columns whose missing values are NaN. Arrow turns every missing value into a
+    null, which comes back as None, so these columns get their NaN back in from_shared
+
+    :param df: The dataframe
+    :type df: pd.DataFrame
+    :return: The columns, None if a column mixes several kinds of missing values
+    """
+    columns = []
+    for column in df.columns[df.dtypes == object]:
+        missing = df[column][df[column].isna()]
+        kinds = {type(value) for value in missing}
+        if kinds and all(issubclass(kind, float) for kind in kinds):
+            columns.append(column)
+        elif kinds - {type(None)}:
+            return None
+
+    return columns
+
+
+def to_shared(df: pd.DataFrame) -> Optional[Tuple[str, int]]:
+    """
+    > Write the dataframe as an Arrow IPC stream in a new shared memory block, without its index. The
+    caller owns the block and must release it
+
+    :param df: The dataframe
+    :type df: pd.DataFrame
+    :return: The name and size of the block, None if the dataframe cannot go through Arrow unchanged
+    """
+    if df.columns.has_duplicates or not all(isinstance(column, str) for column in df.columns):
+        return None
+    nan_columns = _nan_columns(df)
+    if nan_columns is None:
+        return None
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowException, TypeError, ValueError):
+        return None
+    if not _is_flat(table.schema) or not _same_dtypes(df, table.schema):
+        return None
+    table = table.replace_schema_metadata({**table.schema.metadata, b"nan_columns": json.dumps(nan_columns)})
+
+    sink = pa.MockOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    size = sink.size()
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    try:
+        buffer = pa.py_buffer(block.buf)
+        with pa.ipc.new_stream(pa.FixedSizeBufferWriter(buffer), table.schema) as writer:
+            writer.write_table(table)
+        # the Arrow objects export the memory of the block, they must be gone before it is closed
+        del writer, buffer
+    except BaseException:
+        block.close()
+        block.unlink()
+        raise
+    name = block.name
+    block.close()
+
+    return name, size
+
+
+def from_shared(
+    name: str, size: int, index: pd.Index, offset: int = 0, length: Optional[int] = None, release: bool = False
+) -> pd.DataFrame:
+    """
+    > Read rows of a dataframe written in a shared memory block by to_shared. The Arrow buffers are
+    read in place, only the requested rows are converted to pandas, and the object columns get their
+    NaN back
+
+    :param name: The name of the block
+    :type name: str
+    :param size: The size of the Arrow stream in the block
+    :type size: int
+    :param index: The index of the rows read
+    :type index: pd.Index
+    :param offset: The first row to read, defaults to 0
+    :type offset: int (optional)
+    :param length: The number of rows to read, all the rows after offset if None
+    :type length: int (optional)
+    :param release: unlink the block once it is read, defaults to False
+    :type release: bool (optional)
+    :return: The dataframe
+    """
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        buffer = pa.py_buffer(block.buf)
+        table = pa.ipc.open_stream(buffer[:size]).read_all()
+        # some columns (categories, booleans) can be views on the block, copy them out before closing it
+        df = table.slice(offset, length).to_pandas().copy()
+        df.index = index
+        for column in json.loads(table.schema.metadata.get(b"nan_columns", b"[]")):
+            df.loc[df[column].isna(), column] = np.nan
+        del table, buffer
+    finally:
+        block.close()
+        if release:
+            block.unlink()
+
+    return df
+
+
+def release_shared(name: str) -> None:
+    """
+    > Free a shared memory block created by to_shared
+
+    :param name: The name of the block
+    :type name: str
+    """
+    block = shared_memory.SharedMemory(name=name)
+    block.close()
+    block.unlink()
@@ -0,0 +1,155 @@
+import os
+
+import pytest
+
+from src.fixtures.data import FIXTURE_DF
+from langdetect import detect
+
+from src.transform.cache import *
+from src.transform.pipeline import *
+from src.utils.profiler import PipelineProfiler
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    return FIXTURE_DF
+
+
+def make_pipeline(text_format: str = "lower") -> Pipeline:
+    return Pipeline(
+        [
+            ("DataFrameColumnsSelection", DataFrameColumnsSelection(columns=["text", "polarity"])),
+            ("DataFrameTextLength", DataFrameTextLength("text", "text_length")),
+            ("DataFrameTextFormat", DataFrameTextFormat("text", "clean", format=text_format)),
+        ]
+    )
+
+
+def test_hash_frame(dataset):
+    assert hash_frame(dataset) == hash_frame(dataset.copy())
+    assert hash_frame(dataset) != hash_frame(dataset.head(2))
+    assert hash_frame(dataset) != hash_frame(dataset.rename(columns={"text": "other"}))
+    lists = dataset.assign(words=dataset["text"].str.split())
+    assert hash_frame(lists) == hash_frame(lists.copy())
+
+
+def test_stable_repr():
+    assert stable_repr(detect) == "langdetect.detector_factory.detect"
+    assert stable_repr({"b", "a"}) == stable_repr({"a", "b"})
+    operators = [NlpDeDuplicatesSpace("text"), NlpRemoveCharRepetition("text")]
+    assert stable_repr(NlpFusedText("text", operators)) == stable_repr(NlpFusedText("text", operators))
+    assert "0x" not in stable_repr(NlpFusedText("text", operators))
+    with pytest.raises(ValueError):
+        stable_repr(lambda text: "en")
+    with pytest.raises(ValueError):
+        stable_repr(object())
+
+
+def test_step_key_callable(dataset):
+    versions = library_versions()
+    step = NlpDetectLanguage("text", "lang", detector=detect)
+    same_step = NlpDetectLanguage("text", "lang", detector=detect)
+    assert step_key(step, "input", versions) == step_key(same_step, "input", versions)
+    assert step_key(NlpDetectLanguage("text", "lang", detector=lambda text: "en"), "input", versions) is None
+    assert step_key(step, None, versions) is None
+
+
+def test_step_key_spacy_model(monkeypatch):
+    versions = library_versions()
+    steps = [
+        NlpWordLemmatizer("text", "lemma"),
+        NlpDeduplicated(NlpWordLemmatizer("text", "lemma")),
+        NlpFusedText("text", [NlpDeDuplicatesSpace("text"), NlpWordLemmatizer("text")]),
+    ]
+    monkeypatch.setattr(spacy.util, "get_package_version", lambda name: "3.3.0")
+    keys = [step_key(step, "input", versions) for step in steps]
+    monkeypatch.setattr(spacy.util, "get_package_version", lambda name: "3.4.0")
+    assert all(key != step_key(step, "input", versions) for key, step in zip(keys, steps))
+    assert not uses_spacy(DataFrameTextLength("text", "text_length"))
+
+
+def test_step_cache_unkeyed_step(dataset, tmp_path):
+    cache = StepCache(str(tmp_path))
+    pipeline = make_pipeline()
+    pipeline.steps.insert(2, ("NlpDetectLanguage", NlpDetectLanguage("text", "lang", detector=lambda text: "en")))
+    output = cache.process(pipeline, dataset.copy())
+    assert output["lang"].tolist() == ["en", "en", "en"]
+    # the steps from the one that cannot be keyed on are not cached
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_step_cache(dataset, tmp_path):
+    cache = StepCache(str(tmp_path))
+    expected = make_pipeline().fit_transform(dataset.copy())
+    output = cache.process(make_pipeline(), dataset.copy())
+    assert output.equals(expected)
+    assert len(os.listdir(tmp_path)) == 3
+
+    cached_keys = cache.keys(make_pipeline(), dataset)
+    changed_keys = cache.keys(make_pipeline("upper"), dataset)
+    assert cached_keys[:2] == changed_keys[:2]
+    assert cached_keys[2] != changed_keys[2]
+
+    pipeline = make_pipeline("upper")
+    pipeline.steps[1] = ("DataFrameTextLength", None)
+    output = cache.process(pipeline, dataset.copy())
+    assert output["clean"].tolist() == dataset["text"].str.upper().tolist()
+    assert "text_length" not in output
+    assert len(os.listdir(tmp_path)) == 4
+
+
+def test_step_cache_resume(dataset, tmp_path):
+    cache = StepCache(str(tmp_path))
+    cache.process(make_pipeline(), dataset.copy())
+    pipeline = make_pipeline("upper")
+    pipeline.steps[1][1].transform = None
+    output = cache.process(pipeline, dataset.copy())
+    assert output["text_length"].tolist() == [62, 72, 88]
+    assert output["clean"].tolist() == dataset["text"].str.upper().tolist()
+
+
+def test_step_cache_eviction(dataset, tmp_path):
+    cache = StepCache(str(tmp_path))
+    keys = cache.keys(make_pipeline(), dataset)
+    cache.process(make_pipeline(), dataset.copy())
+    os.utime(cache.file(keys[0]), (0, 0))
+    cache.max_bytes = sum(os.path.getsize(cache.file(key)) for key in keys[1:])
+    cache.evict()
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[1]) is not None
+    assert cache.get(keys[2]) is not None
+    assert cache.size == cache.max_bytes
+
+
+def test_step_cache_put_scans_once(dataset, tmp_path, monkeypatch):
+    cache = StepCache(str(tmp_path))
+    scans = []
+    entries = cache.entries
+    monkeypatch.setattr(cache, "entries", lambda: scans.append(1) or entries())
+    keys = cache.keys(make_pipeline(), dataset)
+    cache.process(make_pipeline(), dataset.copy())
+    assert len(scans) == 1
+    assert cache.size == sum(os.path.getsize(cache.file(key)) for key in keys)
+
+    cache.max_bytes = cache.size
+    os.utime(cache.file(keys[0]), (0, 0))
+    cache.put("other", dataset)
+    assert len(scans) == 2
+    assert cache.get(keys[0]) is None
+    assert cache.size <= cache.max_bytes
+
+
+def test_pipeline_cache(dataset, tmp_path):
+    transform = PipelineTransform(make_pipeline(), njobs=1, cache=StepCache(str(tmp_path)))
+    output = transform.transform(dataset, None)
+    assert output.equals(make_pipeline().fit_transform(dataset.copy()))
+    assert len(os.listdir(tmp_path)) == 3
+
+
+def test_step_cache_profile(dataset, tmp_path):
+    cache = StepCache(str(tmp_path))
+    cache.process(make_pipeline(), dataset.copy())
+    profiler = PipelineProfiler()
+    cache.process(make_pipeline("upper"), dataset.copy(), profiler=profiler)
+    assert list(profiler.stats) == ["DataFrameTextFormat"]
+    assert profiler.stats["DataFrameTextFormat"]["rows_out"] == 3
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+from src.transform.checkpoint import *
+from src.transform.pipeline import *
+
+
+class DataFrameFailOnRow(BaseEstimator):
+    def __init__(self, row: int, flag_file: str) -> None:
+        self.row = row
+        self.flag_file = flag_file
+
+    def fit(self, x, y=None):
+        return self
+
+    def transform(self, x):
+        if os.path.exists(self.flag_file) and self.row in x.index:
+            raise ValueError(f"malformed row {self.row}")
+        with open(self.flag_file + ".log", "a") as f:
+            f.write(f"{x.index[0]}\n")
+
+        return x
+
+
+@pytest.fixture
+def dataset():
+    return pd.DataFrame({"text": [f"text number {i}" for i in range(20)], "polarity": [i % 2 for i in range(20)]})
+
+
+def test_chunk_offsets(dataset):
+    assert chunk_offsets(dataset.iloc[5:10]) == [5, 9]
+    assert chunk_offsets(dataset.iloc[:0]) is None
+
+
+def test_checkpoint_resume(dataset, tmp_path):
+    flag_file = str(tmp_path / "fail")
+    open(flag_file, "w").close()
+    pipeline = Pipeline(
+        [
+            ("DataFrameTextLength", DataFrameTextLength("text", "text_length")),
+            ("DataFrameFailOnRow", DataFrameFailOnRow(12, flag_file)),
+        ]
+    )
+    checkpoint = ChunkCheckpoint(str(tmp_path / "checkpoint"))
+    transform = PipelineTransform(pipeline, njobs=1, queue_depth=0, checkpoint=checkpoint)
+    with pytest.raises(ValueError):
+        transform.transform(dataset, 5)
+    assert sorted(checkpoint.manifest["chunks"]) == ["0", "1"]
+
+    os.remove(flag_file)
+    os.remove(flag_file + ".log")
+    transform = PipelineTransform(pipeline, njobs=1, queue_depth=2, checkpoint=ChunkCheckpoint(checkpoint.path))
+    output = transform.transform(dataset, 5)
+    assert output.equals(dataset.assign(text_length=dataset["text"].str.len()))
+    with open(flag_file + ".log") as f:
+        assert f.read().split() == ["10", "15"]
+
+    pipeline.steps[0] = ("DataFrameTextLength", DataFrameTextLength("text", "length"))
+    transform = PipelineTransform(pipeline, njobs=1, checkpoint=ChunkCheckpoint(checkpoint.path))
+    output = transform.transform(dataset, 5)
+    assert "length" in output
+
+
+def test_checkpoint_without_fingerprint(dataset, tmp_path):
+    # a lambda has no stable description, the run cannot be recognized after a restart
+    pipeline = Pipeline([("NlpDetectLanguage", NlpDetectLanguage("text", "lang", detector=lambda text: "en"))])
+    assert run_fingerprint(pipeline, dataset, 5) is None
+    checkpoint = ChunkCheckpoint(str(tmp_path / "checkpoint"))
+    output = PipelineTransform(pipeline, njobs=1, checkpoint=checkpoint).transform(dataset, 5)
+    assert output["lang"].eq("en").all()
+    assert checkpoint.manifest == {"fingerprint": None, "chunks": {}}
+    assert not os.path.exists(checkpoint.path)
@@ -2,6 +2,7 @@ import pytest
 
 from src.fixtures.data import FIXTURE_DF
 from src.transform.nlp_operator import *
+from src.transform.nlp_operator import _SPACY_MODELS
 
 
 @pytest.fixture(scope="module")
@@ -28,6 +29,33 @@ def test_NlpDetectLanguage(dataset):
     }
 
 
+def test_NlpDetectLanguage_fast_path():
+    calls = []
+
+    def detector(text):
+        calls.append(text)
+        return text.lower()
+
+    dataset = pd.DataFrame({"text": ["Bonjour tout le monde", "Hello world", "Bonjour tout le monde", "Hello there"]})
+    pipe = NlpDetectLanguage(text_column="text", new_column="lang", max_length=5, detector=detector)
+    pipe.fit(dataset)
+    output = pipe.transform(dataset.copy())
+    assert output["lang"].tolist() == ["bonjo", "hello", "bonjo", "hello"]
+    assert calls == ["Bonjo", "Hello"]
+    pipe.transform(dataset.copy())
+    assert calls == ["Bonjo", "Hello"]
+
+
+def test_NlpDetectLanguage_n_process(dataset):
+    seed = DetectorFactory.seed
+    pipe = NlpDetectLanguage(text_column="text", new_column="lang", n_process=2, batch_size=1, seed=42)
+    pipe.fit(dataset)
+    assert DetectorFactory.seed == seed
+    output = pipe.transform(dataset.copy())
+    assert output["lang"].tolist() == ["en", "en", "en"]
+    assert DetectorFactory.seed == seed
+
+
 def test_NlpWordExpansion(dataset):
     dataset = dataset.copy()
     pipe = NlpWordExpansion(text_column="text", new_column="text2")
@@ -92,6 +120,17 @@ def test_NlpTextToSentences(dataset):
     }
 
 
+def test_load_spacy_model():
+    assert load_spacy_model(components=()).pipe_names == []
+    assert load_spacy_model(components=("senter",)).pipe_names == ["senter"]
+    assert "ner" in load_spacy_model().pipe_names
+
+
+def test_get_spacy_model():
+    assert get_spacy_model(components=("senter",)) is get_spacy_model(components=["senter"])
+    assert NlpTextToWords("text").nlp is NlpRemoveStopwords("text").nlp
+
+
 def test_NlpTextToWords(dataset):
     dataset = dataset.copy()
     pipe = NlpTextToWords(text_column="text", new_column="words")
@@ -166,6 +205,33 @@ def test_NlpTextToWords(dataset):
     }
 
 
+def test_NlpTextToWords_batched(dataset):
+    dataset = dataset.copy()
+    pipe = NlpTextToWords(text_column="text", new_column="words", batch_size=2)
+    pipe.fit(dataset)
+    output = pipe.transform(dataset)
+    assert output["words"].tolist() == [pipe.text_to_tokens(text) for text in dataset["text"]]
+
+
+def test_NlpSpacyParse(dataset):
+    dataset = dataset.copy()
+    lemmatizer_model = (SPACY_MODEL, tuple(sorted(NlpWordLemmatizer.components)))
+    _SPACY_MODELS.pop(lemmatizer_model, None)
+    parse = NlpSpacyParse(text_column="text")
+    parse.fit(dataset)
+    output = parse.transform(dataset)
+    pipe = NlpWordLemmatizer(text_column="text", new_column="lemma", doc_column="text_doc")
+    pipe.fit(output)
+    output = pipe.transform(output)
+    # reading the parsed docs never loads the operator's own model
+    assert lemmatizer_model not in _SPACY_MODELS
+    assert output["lemma"].to_dict() == {
+        0: "first think another Disney movie , might good , it be kid movie .",
+        1: "put aside Dr. House repeat miss , Desperate Housewives ( new ) watch one .",
+        2: "big fan Stephen King 's work , film make even great fan king . Pet Sematary Creed family .",
+    }
+
+
 def test_NlpWordLemmatizer(dataset):
     dataset = dataset.copy()
     pipe = NlpWordLemmatizer(text_column="text")
@@ -184,6 +250,34 @@ def test_NlpWordLemmatizer(dataset):
     }
 
 
+@pytest.mark.parametrize(
+    "text",
+    [
+        "It's fine",
+        "IT'S",
+        "iT's",
+        "Don't do it, they'd've gone",
+        "I\u2019m here",
+        "o'clock",
+        "rock'n'roll",
+        "can't!",
+        "no contraction here",
+    ],
+)
+def test_NlpWordExpansion_fast(text):
+    dataset = pd.DataFrame({"text": [text, None]})
+    pipe = NlpWordExpansion(text_column="text", new_column="expanded", fast=True)
+    pipe.fit(dataset)
+    output = pipe.transform(dataset.copy())
+    assert output["expanded"][0] == contractions.fix(text)
+    assert output["expanded"][1] is None
+
+
+def test_NlpWordExpansion_fast_skips_slang():
+    pipe = NlpWordExpansion(text_column="text", fast=True)
+    assert pipe.fit(None).expand_contractions("dont gonna") == "dont gonna"
+
+
 def test_NlpReplaceEmojis(dataset):
     dataset = dataset.copy()
     pipe = NlpReplaceEmojis(text_column="text")
@@ -220,6 +314,37 @@ def test_NlpReplaceEmoticons(dataset):
     }
 
 
+def test_NlpReplaceEmojis_NlpReplaceEmoticons_matches():
+    texts = ["I love python \u262e \U0001f642 \u2764 :-) :-( :-)))", "one :)", "two \U0001f642"]
+    dataset = pd.DataFrame({"text": texts})
+    output = NlpReplaceEmoticons(text_column="text").fit(dataset).transform(
+        NlpReplaceEmojis(text_column="text").fit(dataset).transform(dataset.copy())
+    )
+    assert output["text"].tolist() == [
+        "I love python :peace_symbol: :slightly_smiling_face: :red_heart: Happy face smiley Frown, sad, andry or "
+        "pouting Very very Happy face or smiley",
+        "one Happy face or smiley",
+        "two :slightly_smiling_face:",
+    ]
+
+
+@pytest.mark.parametrize("how", ["replace", "remove"])
+def test_NlpReplaceEmotes(how):
+    texts = ["I love python \u262e \U0001f642 \u2764 :-) :-( :-)))", "plain text", "\u00e9t\u00e9 :)"]
+    dataset = pd.DataFrame({"text": texts})
+    expected = NlpReplaceEmoticons(text_column="text", how=how).fit(dataset).transform(
+        NlpReplaceEmojis(text_column="text", how=how).fit(dataset).transform(dataset.copy())
+    )
+    pipe = NlpReplaceEmotes(text_column="text", new_column="clean", how=how)
+    pipe.fit(dataset)
+    output = pipe.transform(dataset.copy())
+    assert output["clean"].tolist() == expected["text"].tolist()
+
+    pipe = NlpReplaceEmotes(text_column="text", new_column="clean", emoticons=False)
+    output = pipe.fit(dataset).transform(dataset.copy())
+    assert output["clean"][1:].tolist() == ["plain text", "\u00e9t\u00e9 :)"]
+
+
 def test_NlpDeDuplicatesSpace(dataset):
     dataset = dataset.copy()
     pipe = NlpDeDuplicatesSpace(text_column="text")
@@ -826,3 +951,74 @@ def test_NlpSpeechTagging(dataset):
             ],
         },
     }
+
+
+def test_NlpFusedText(dataset):
+    dataset = dataset.copy()
+    dataset["text"] = ["so   goooood good good good  movie", "it's   fine", "nooo"]
+    pipe = NlpFusedText(
+        text_column="text",
+        operators=[NlpDeDuplicatesSpace("text"), NlpReplaceWordRepetition("text"), NlpRemoveCharRepetition("text")],
+        new_column="clean",
+    )
+    pipe.fit(dataset)
+    output = pipe.transform(dataset)
+    assert output["clean"].to_dict() == {0: "so god good movie", 1: "it's fine", 2: "no"}
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_NlpTextNormalizer(dataset, vectorized):
+    dataset = dataset.copy()
+    dataset["text"] = ["so   goooood good good good  movie", "it's   fine", "nooo"]
+    pipe = NlpTextNormalizer(text_column="text", new_column="clean", vectorized=vectorized)
+    pipe.fit(dataset)
+    output = pipe.transform(dataset)
+    assert output["clean"].to_dict() == {0: "so god good movie", 1: "it's fine", 2: "no"}
+
+
+def test_NlpDeduplicated():
+    dataset = pd.DataFrame({"text": ["Hello  world", "Bonjour", None, "Hello  world"]}, index=[2, 4, 6, 8])
+    seen = []
+    operator = NlpDeDuplicatesSpace(text_column="text", new_column="clean")
+    operator.transform = lambda x: seen.extend(x["text"]) or x.assign(
+        clean=x["text"].map(operator.remove_multiple_spaces)
+    )
+    pipe = NlpDeduplicated(operator)
+    pipe.fit(dataset)
+    output = pipe.transform(dataset.copy())
+    assert output["clean"].tolist()[:2] == ["Hello world", "Bonjour"]
+    assert output["clean"].isnull().tolist() == [False, False, True, False]
+    assert output["clean"][8] == "Hello world"
+    assert seen == ["Hello  world", "Bonjour"]
+
+
+@pytest.mark.parametrize("output", ["records", "columns"])
+def test_NlpSpeechTagging_output(output):
+    nlp = spacy.blank("en")
+    dataset = pd.DataFrame({"text": ["Hello big world", "", "Bye!"]}, index=[3, 5, 7])
+    dataset["doc"] = list(nlp.pipe(dataset["text"]))
+    pipe = NlpSpeechTagging(text_column="text", new_column="pos", doc_column="doc", output=output)
+    pipe.fit(dataset)
+    output_df = pipe.transform(dataset.copy())
+    records = [
+        [{name: getattr(token, attribute) for name, attribute in POS_ATTRIBUTES.items()} for token in doc]
+        for doc in dataset["doc"]
+    ]
+    if output == "records":
+        assert output_df["pos"].tolist() == records
+    else:
+        assert output_df["pos"][3]["token"] == ["Hello", "big", "world"]
+        assert output_df["pos"][5] == {name: [] for name in POS_ATTRIBUTES}
+        assert [pd.DataFrame(value).to_dict("records") for value in output_df["pos"]] == records
+
+
+def test_NlpSpeechTagging_token_table():
+    nlp = spacy.blank("en")
+    dataset = pd.DataFrame({"text": ["Hello big world", "", "Bye!"]}, index=[3, 5, 7])
+    dataset["doc"] = list(nlp.pipe(dataset["text"]))
+    table = NlpSpeechTagging(text_column="text", doc_column="doc").token_table(dataset)
+    assert table["row_id"].tolist() == [3, 3, 3, 7, 7]
+    assert table["token_id"].tolist() == [0, 1, 2, 0, 1]
+    assert table["token"].tolist() == ["Hello", "big", "world", "Bye", "!"]
+    assert table["is_alpha"].tolist() == [True, True, True, True, False]
+    assert table["shape"].dtype == "category"
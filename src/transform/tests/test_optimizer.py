@@ -0,0 +1,132 @@
+import pytest
+
+from src.fixtures.data import FIXTURE_DF
+from src.transform.optimizer import *
+
+
+def test_query_columns():
+    assert query_columns(DataFrameQueryFilter("number_words", query="> 10")) == {"number_words"}
+    assert query_columns(DataFrameQueryFilter("lang", query="== 'en' and `text length` > min_length")) == {
+        "lang",
+        "text length",
+        "min_length",
+    }
+
+
+def test_required_columns():
+    pipeline = Pipeline(
+        [
+            ("DataFrameColumnsRename", DataFrameColumnsRename({"review": "text"})),
+            ("DataFrameTextLength", DataFrameTextLength("text", "text_length")),
+            ("DataFrameQueryFilter", DataFrameQueryFilter("text_length", query="> rating")),
+            ("DataFrameColumnsSelection", DataFrameColumnsSelection(columns=["text", "text_length", "polarity"])),
+        ]
+    )
+    assert required_columns(pipeline) == ["polarity", "rating", "review"]
+
+
+def test_required_columns_without_projection():
+    pipeline = Pipeline([("DataFrameTextLength", DataFrameTextLength("text", "text_length"))])
+    assert required_columns(pipeline) is None
+
+
+def test_reader_filters():
+    pipeline = Pipeline(
+        [
+            ("DataFrameColumnsSelection", DataFrameColumnsSelection(columns=["text", "polarity"])),
+            ("DataFrameTextLength", DataFrameTextLength("text", "text_length")),
+            ("NlpDetectLanguage", NlpDetectLanguage("text", "lang")),
+            ("DataFrameQueryFilter", DataFrameQueryFilter("polarity", query="== 1")),
+            ("DataFrameValueFrequency", DataFrameValueFrequency("polarity", "freq")),
+            ("NlpTextToWords", NlpTextToWords("text", "words")),
+            ("DataFrameQueryFilter2", DataFrameQueryFilter("text_length", query="> 10")),
+        ]
+    )
+    optimized = optimize_pipeline(pipeline)
+    assert [name for name, _ in optimized.steps] == [
+        "DataFrameQueryFilter",
+        "DataFrameColumnsSelection",
+        "DataFrameTextLength",
+        "NlpDetectLanguage",
+        "DataFrameValueFrequency",
+        "DataFrameQueryFilter2",
+        "NlpTextToWords",
+    ]
+    assert reader_filters(optimized) == [("polarity", "==", 1)]
+    assert reader_filters(pipeline) == []
+
+
+def test_dependency_graph():
+    pipeline = Pipeline(
+        [
+            ("DataFrameTextLength", DataFrameTextLength("text", "text_length")),
+            ("NlpDeDuplicatesSpace", NlpDeDuplicatesSpace("text")),
+            ("DataFrameColumnsDrop", DataFrameColumnsDrop(columns=["useless"])),
+            ("DataFrameQueryFilter", DataFrameQueryFilter("text_length", query="> 10")),
+        ]
+    )
+    assert dependency_graph(pipeline) == {0: set(), 1: {0}, 2: set(), 3: {0}}
+
+
+def test_optimize_pipeline():
+    pipeline = Pipeline(
+        [
+            ("DataFrameTextLength", DataFrameTextLength("text", "text_length")),
+            ("NlpDeDuplicatesSpace", NlpDeDuplicatesSpace("text", "clean")),
+            ("DataFrameTextNumberWords", DataFrameTextNumberWords("text", "number_words")),
+            ("NlpRemoveCharRepetition", NlpRemoveCharRepetition("clean")),
+            ("NlpDetectLanguage", NlpDetectLanguage("text", "lang")),
+            ("DataFrameQueryFilter", DataFrameQueryFilter("text_length", query="> 10")),
+            ("DataFrameColumnsDrop", DataFrameColumnsDrop(columns=["lang"])),
+        ]
+    )
+    optimized = optimize_pipeline(pipeline)
+    assert [name for name, _ in optimized.steps] == [
+        "DataFrameColumnsDrop",
+        "DataFrameTextLength",
+        "DataFrameQueryFilter",
+        "NlpDeDuplicatesSpace+NlpRemoveCharRepetition",
+        "DataFrameTextNumberWords",
+    ]
+    assert optimized.steps[0][1].errors == "ignore"
+    fused = optimized.steps[3][1]
+    assert isinstance(fused, NlpTextNormalizer)
+    assert (fused.text_column, fused.new_column, fused.steps) == ("text", "clean", ["spaces", "char_repetition"])
+    assert [name for name, _ in pipeline.steps][-1] == "DataFrameColumnsDrop"
+
+
+@pytest.mark.parametrize(
+    "steps",
+    [
+        [
+            ("DataFrameTextLength", DataFrameTextLength("text", "text_length")),
+            ("NlpDeDuplicatesSpace", NlpDeDuplicatesSpace("text", "clean")),
+            ("DataFrameTextNumberWords", DataFrameTextNumberWords("text", "number_words")),
+            ("NlpRemoveCharRepetition", NlpRemoveCharRepetition("clean")),
+            ("DataFrameQueryFilter", DataFrameQueryFilter("number_words", query="> 11")),
+            ("DataFrameColumnsDrop", DataFrameColumnsDrop(columns=["useless", "text_length"])),
+        ],
+        [
+            ("DataFrameTextFormat", DataFrameTextFormat("type", "genre", format="upper")),
+            ("NlpDeDuplicatesSpace", NlpDeDuplicatesSpace("text", "clean")),
+            ("DataFrameTextLength", DataFrameTextLength("text", "text_length")),
+            ("DataFrameColumnsRename", DataFrameColumnsRename(columns_mapping={"id": "review_id"})),
+            ("NlpRemoveCharRepetition", NlpRemoveCharRepetition("clean")),
+            ("DataFrameQueryFilter", DataFrameQueryFilter("polarity", query="== 1")),
+            ("DataFrameColumnsSelection", DataFrameColumnsSelection(columns=["clean", "review_id", "genre"])),
+        ],
+        [
+            ("DataFrameTextNumberWords", DataFrameTextNumberWords("text", "number_words")),
+            ("DataFrameTextLength", DataFrameTextLength("type", "type_length")),
+            ("DataFrameTextNumberWords_2", DataFrameTextNumberWords("text", "number_words")),
+        ],
+    ],
+    ids=["drop", "selection", "overwrite"],
+)
+def test_optimize_pipeline_same_output(steps):
+    pipeline = Pipeline(steps)
+    expected = pipeline.fit_transform(FIXTURE_DF.copy())
+    output = optimize_pipeline(pipeline).fit_transform(FIXTURE_DF.copy())
+    # the optimized pipeline keeps the column order, not just the values
+    assert list(output.columns) == list(expected.columns)
+    assert output.to_dict() == expected.to_dict()
@@ -59,9 +59,10 @@ def test_DataFrameColumnsRename(dataset):
     }
 
 
-def test_DataFrameTextFormat(dataset):
+@pytest.mark.parametrize("engine", ["pandas", "pyarrow"])
+def test_DataFrameTextFormat(dataset, engine):
     dataset = dataset.copy()
-    pipe = DataFrameTextFormat(text_column="text")
+    pipe = DataFrameTextFormat(text_column="text", engine=engine)
     pipe.fit(dataset)
     output = pipe.transform(dataset)
     assert output.to_dict() == {
@@ -95,9 +96,10 @@ def test_DataFrameDropEmptyRows(dataset):
     }
 
 
-def test_DataFrameTextLength(dataset):
+@pytest.mark.parametrize("engine", ["pandas", "pyarrow"])
+def test_DataFrameTextLength(dataset, engine):
     dataset = dataset.copy()
-    pipe = DataFrameTextLength(text_column="text", new_column="length")
+    pipe = DataFrameTextLength(text_column="text", new_column="length", engine=engine)
     pipe.fit(dataset)
     output = pipe.transform(dataset)
     assert output.to_dict() == {
@@ -114,9 +116,10 @@ def test_DataFrameTextLength(dataset):
     }
 
 
-def test_DataFrameTextNumberWords(dataset):
+@pytest.mark.parametrize("engine", ["pandas", "pyarrow"])
+def test_DataFrameTextNumberWords(dataset, engine):
     dataset = dataset.copy()
-    pipe = DataFrameTextNumberWords(text_column="text", new_column="words_number")
+    pipe = DataFrameTextNumberWords(text_column="text", new_column="words_number", engine=engine)
     pipe.fit(dataset)
     output = pipe.transform(dataset)
     assert output.to_dict() == {
@@ -133,6 +136,23 @@ def test_DataFrameTextNumberWords(dataset):
     }
 
 
+@pytest.mark.parametrize("format", ["lower", "upper", "capitalize"])
+def test_DataFrameTextFormat_engines(format):
+    dataset = pd.DataFrame({"text": ["Bonjour  le MONDE", None, "", "élan Été"]})
+    pandas_output = DataFrameTextFormat(text_column="text", format=format).transform(dataset.copy())
+    arrow_output = DataFrameTextFormat(text_column="text", format=format, engine="pyarrow").transform(dataset.copy())
+    assert pandas_output.equals(arrow_output)
+
+
+@pytest.mark.parametrize("operator", [DataFrameTextLength, DataFrameTextNumberWords])
+def test_text_counts_engines(operator):
+    texts = [" a  b\tc\n", None, "", "élan Été", "a\xa0b", "a\u2003b\vc", "\x1fa\u3000", 12, 1.5]
+    dataset = pd.DataFrame({"text": texts}, index=range(3, 3 + 2 * len(texts), 2))
+    pandas_output = operator(text_column="text", new_column="count").transform(dataset.copy())
+    arrow_output = operator(text_column="text", new_column="count", engine="pyarrow").transform(dataset.copy())
+    pd.testing.assert_series_equal(pandas_output["count"], arrow_output["count"])
+
+
 def test_DataFrameValueFrequency(dataset):
     dataset = dataset.copy()
     pipe = DataFrameValueFrequency(text_column="polarity", new_column="frequency")
@@ -193,3 +213,13 @@ def test_DataFrameQueryFilter(dataset):
         },
         "polarity": {0: 1, 2: 1},
     }
+
+
+def test_DataFrameToParquet_DataFrameReadParquet(dataset, tmp_path):
+    dataset = dataset.copy()
+    path = str(tmp_path / "dataset.parquet")
+    DataFrameToParquet(output_path=path).fit(dataset).transform(dataset)
+    pipe = DataFrameReadParquet(path=path, columns=["polarity", "id", "missing"])
+    pipe.fit(None)
+    output = pipe.transform(None)
+    assert output.to_dict() == {"id": {0: 1, 1: 2, 2: 3}, "polarity": {0: 1, 1: 0, 2: 1}}
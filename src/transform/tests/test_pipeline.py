@@ -1,3 +1,7 @@
+import json
+import os
+import sys
+
 import pytest
 
 from src.fixtures.data import FIXTURE_DF
@@ -71,3 +75,294 @@ def test_pipeline_incorrect_result(dataset):
         "freq": {1: 1, 2: 2},
         "lang": {1: "ENGLISH", 2: "ENGLISH"},
     }
+
+
+def test_pipeline_persistent_pool(dataset):
+    pipeline = Pipeline(
+        [
+            ("DataFrameTextLength", DataFrameTextLength("text", "text_length")),
+        ]
+    )
+    with PipelineTransform(pipeline, njobs=2) as transform:
+        pool = transform.pool
+        first = transform.transform(dataset, 1)
+        second = transform.transform(dataset, 1)
+        assert transform.pool is pool
+    assert transform.pool is None
+    assert first.to_dict() == second.to_dict()
+    assert first["text_length"].to_dict() == {0: 62, 1: 72, 2: 88}
+
+
+def test_pipeline_fit_once(dataset):
+    pipeline = Pipeline(
+        [
+            ("NlpDeDuplicatesSpace", NlpDeDuplicatesSpace("text")),
+            ("NlpReplaceEmoticons", NlpReplaceEmoticons("text")),
+            ("DataFrameTextLength", DataFrameTextLength("text", "text_length")),
+        ]
+    )
+    transform = PipelineTransform(pipeline, njobs=2, fit_once=True, fit_sample=2)
+    output = transform.transform(dataset, 1)
+    assert transform.fitted
+    assert pipeline.named_steps["NlpReplaceEmoticons"].emot_obj is not None
+    assert output["text_length"].to_dict() == {0: 62, 1: 72, 2: 88}
+    assert dataset.columns.tolist() == ["id", "type", "useless", "text", "polarity"]
+
+
+def test_pipeline_preload_wrapped_operators(monkeypatch):
+    preloaded = []
+    monkeypatch.setattr(NlpSpacyOperator, "preload", lambda operator: preloaded.append(operator))
+    lemmatizer, tagger = NlpWordLemmatizer("text", "lemma"), NlpSpeechTagging("text", "pos")
+    pipeline = Pipeline(
+        [
+            ("NlpDeduplicated", NlpDeduplicated(lemmatizer)),
+            ("NlpFusedText", NlpFusedText("text", [NlpDeDuplicatesSpace("text"), tagger])),
+            ("NlpTextToWords", NlpTextToWords("text", "words", doc_column="text_doc")),
+        ]
+    )
+    PipelineTransform(pipeline).preload()
+    assert preloaded == [lemmatizer, tagger]
+
+
+def test_pipeline_detect_language_n_process(dataset):
+    # the workers of the pool are daemonic and cannot start the operator's own pool
+    pipeline = Pipeline([("NlpDetectLanguage", NlpDetectLanguage("text", "lang", n_process=2, batch_size=1))])
+    output = PipelineTransform(pipeline, njobs=2).transform(dataset, None)
+    assert output["lang"].tolist() == ["en", "en", "en"]
+
+
+class _WorkerPid(BaseEstimator):
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        X["pid"] = os.getpid()
+        return X
+
+
+@pytest.mark.parametrize("chunksize", [1, None])
+def test_pipeline_fit_once_in_workers(dataset, chunksize):
+    pipeline = Pipeline(
+        [
+            ("DataFrameTextLength", DataFrameTextLength("text", "text_length")),
+            ("WorkerPid", _WorkerPid()),
+        ]
+    )
+    with PipelineTransform(pipeline, njobs=2, fit_once=True, profile=True) as transform:
+        output = transform.transform(dataset, chunksize)
+    assert output["text_length"].to_dict() == {0: 62, 1: 72, 2: 88}
+    # the pipeline is fitted on a sample in the main process, every chunk is transformed by the workers
+    assert os.getpid() not in output["pid"].tolist()
+    assert transform.profiler.stats["DataFrameTextLength"]["rows_in"] == 3
+
+
+def test_pipeline_iter_transform(dataset, tmp_path):
+    pipeline = Pipeline(
+        [
+            ("DataFrameColumnsSelection", DataFrameColumnsSelection(columns=["text", "polarity"])),
+            ("DataFrameTextLength", DataFrameTextLength("text", "text_length")),
+        ]
+    )
+    transform = PipelineTransform(pipeline, njobs=1)
+    chunks = list(transform.iter_transform(dataset, 1))
+    assert [chunk["text_length"].tolist() for chunk in chunks] == [[62], [72], [88]]
+    assert transform.pool is None
+
+    output_file = str(tmp_path / "output.csv")
+    assert transform.transform_to(dataset, output_file, 2) == 3
+    assert pd.read_csv(output_file).to_dict() == pd.concat(chunks).reset_index(drop=True).to_dict()
+
+
+def test_pipeline_queue_depth(dataset, tmp_path):
+    input_file = str(tmp_path / "input.csv")
+    pd.concat([dataset] * 4, ignore_index=True).to_csv(input_file, index=False)
+    pipeline = Pipeline([("DataFrameTextLength", DataFrameTextLength("text", "text_length"))])
+    outputs = []
+    for queue_depth in [0, 1, 3]:
+        with PipelineTransform(pipeline, njobs=2, queue_depth=queue_depth) as transform:
+            outputs.append(transform.transform(input_file, 2))
+    assert outputs[0]["text_length"].tolist() == [62, 72, 88] * 4
+    assert outputs[0].to_dict() == outputs[1].to_dict() == outputs[2].to_dict()
+
+
+@pytest.mark.parametrize("extension", ["csv", "parquet", "arrow"])
+def test_pipeline_file_formats(dataset, tmp_path, extension):
+    input_file = str(tmp_path / f"input.{extension}")
+    output_file = str(tmp_path / f"output.{extension}")
+    PipelineTransform.write_data([dataset.iloc[:2], dataset.iloc[2:]], input_file)
+    chunks = list(PipelineTransform.read_data(input_file, 2, columns=["text", "polarity"]))
+    assert [chunk.index.tolist() for chunk in chunks] == [[0, 1], [2]]
+    assert pd.concat(chunks).to_dict() == dataset[["text", "polarity"]].to_dict()
+
+    pipeline = Pipeline([("DataFrameTextLength", DataFrameTextLength("text", "text_length"))])
+    transform = PipelineTransform(pipeline, njobs=1)
+    assert transform.transform_to(input_file, output_file, 2) == 3
+    output = pd.concat(PipelineTransform.read_data(output_file, None))
+    assert output["text_length"].tolist() == [62, 72, 88]
+
+
+def test_pipeline_column_projection(dataset, tmp_path):
+    input_file = str(tmp_path / "input.csv")
+    dataset.to_csv(input_file, index=False)
+    pipeline = Pipeline(
+        [
+            ("DataFrameTextLength", DataFrameTextLength("text", "text_length")),
+            ("DataFrameColumnsSelection", DataFrameColumnsSelection(columns=["text_length", "polarity"])),
+        ]
+    )
+    transform = PipelineTransform(pipeline, njobs=1)
+    assert transform.input_columns() == ["polarity", "text"]
+    assert [chunk.columns.tolist() for chunk in transform.read_data(input_file, 2, transform.input_columns())] == [
+        ["text", "polarity"],
+        ["text", "polarity"],
+    ]
+    assert transform.transform(input_file, 2).to_dict() == {
+        "text_length": {0: 62, 1: 72, 2: 88},
+        "polarity": {0: 1, 1: 0, 2: 1},
+    }
+
+
+@pytest.mark.parametrize("chunksize", [2, None])
+@pytest.mark.parametrize("extension", ["csv", "parquet", "arrow"])
+def test_pipeline_predicate_pushdown(dataset, tmp_path, extension, chunksize):
+    input_file = str(tmp_path / f"input.{extension}")
+    PipelineTransform.write_data([dataset], input_file)
+    pipeline = Pipeline(
+        [
+            ("DataFrameTextLength", DataFrameTextLength("text", "text_length")),
+            ("DataFrameQueryFilter", DataFrameQueryFilter("type", query="!= 'comedy'")),
+        ]
+    )
+    transform = PipelineTransform(pipeline, njobs=1, optimize=True)
+    assert transform.input_filters() == [("type", "!=", "comedy")]
+    output = transform.transform(input_file, chunksize)
+    assert output["text_length"].to_dict() == {0: 62, 2: 88}
+    assert list(output.columns) == list(dataset.columns) + ["text_length"]
+    filters = [("type", "!=", "comedy"), ("id", ">", 1), ("text", "notnull", None)]
+    output = pd.concat(PipelineTransform.read_data(input_file, chunksize, filters=filters))
+    assert output["id"].to_dict() == {2: 3}
+
+
+def test_shared_memory(dataset):
+    pipeline = Pipeline(
+        [
+            ("DataFrameTextLength", DataFrameTextLength("text", "text_length")),
+            ("DataFrameQueryFilter", DataFrameQueryFilter("text_length", query=">70")),
+        ]
+    )
+    expected = PipelineTransform(pipeline, njobs=2).transform(dataset, None)
+    with PipelineTransform(pipeline, njobs=2, shared_memory=True) as transform:
+        output = transform.transform(dataset, None)
+        assert output.equals(expected)
+        assert output.index.tolist() == [1, 2]
+
+
+class _FailOn(BaseEstimator):
+    def __init__(self, index: int) -> None:
+        self.index = index
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        if self.index in X.index:
+            raise ValueError(f"row {self.index}")
+        return X
+
+
+def test_shared_memory_same_as_pickled(dataset):
+    dataset = dataset.assign(text=dataset["text"].where(dataset["id"] != 2), id=dataset["id"].astype(object))
+    pipeline = Pipeline([("DataFrameTextLength", DataFrameTextLength("text", "text_length"))])
+    expected = PipelineTransform(pipeline, njobs=2).transform(dataset, None)
+    output = PipelineTransform(pipeline, njobs=2, shared_memory=True).transform(dataset, None)
+    assert output.equals(expected)
+    assert output["id"].dtype == object
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="needs the POSIX shared memory directory")
+def test_shared_memory_error_releases_blocks(dataset):
+    pipeline = Pipeline([("FailOn", _FailOn(2))])
+    blocks = set(os.listdir("/dev/shm"))
+    with PipelineTransform(pipeline, njobs=2, shared_memory=True, task_size=1) as transform:
+        with pytest.raises(ValueError, match="row 2"):
+            transform.transform(dataset, None)
+    assert set(os.listdir("/dev/shm")) <= blocks
+
+
+def test_shared_memory_python_version(dataset, monkeypatch):
+    pipeline = Pipeline([("DataFrameTextLength", DataFrameTextLength("text", "text_length"))])
+    monkeypatch.setattr(sys, "version_info", (3, 7, 12))
+    with pytest.raises(AssertionError, match="Python 3.8"):
+        PipelineTransform(pipeline, shared_memory=True)
+    assert PipelineTransform(pipeline).shared_memory is False
+
+
+def test_split_bounds():
+    df = pd.DataFrame({"text": ["a" * 100, "b", "c", "d", "e" * 100, "f"]})
+    pipeline = Pipeline([("DataFrameTextLength", DataFrameTextLength("text", "text_length"))])
+    assert PipelineTransform(pipeline, njobs=1).split_bounds(df) == [(0, 6)]
+    assert PipelineTransform(pipeline, njobs=1, task_size=4).split_bounds(df) == [(0, 3), (3, 3)]
+    assert PipelineTransform(pipeline, njobs=1, task_size=2).split_bounds(df) == [(0, 2), (2, 2), (4, 2)]
+    transform = PipelineTransform(pipeline, njobs=1, task_size=2, balance_column="text")
+    assert transform.split_bounds(df) == [(0, 1), (1, 4), (5, 1)]
+    assert transform.split_bounds(df.iloc[:0]) == [(0, 0)]
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+def test_balance_column_projection(dataset, tmp_path, optimize):
+    input_file = str(tmp_path / "input.csv")
+    dataset.to_csv(input_file, index=False)
+    pipeline = Pipeline(
+        [
+            ("DataFrameColumnsSelection", DataFrameColumnsSelection(columns=["polarity"])),
+            ("DataFrameQueryFilter", DataFrameQueryFilter("polarity", query="== 1")),
+        ]
+    )
+    transform = PipelineTransform(pipeline, njobs=2, balance_column="text", optimize=optimize)
+    assert transform.input_columns() == ["polarity", "text"]
+    for input in [dataset, input_file]:
+        assert transform.transform(input, 2).to_dict() == {"polarity": {0: 1, 2: 1}}
+
+
+@pytest.mark.parametrize("shared_memory", [False, True])
+def test_scheduler(shared_memory):
+    df = pd.DataFrame({"text": [f"{'word ' * (i % 7)}text {i}" for i in range(50)]}, index=range(100, 150))
+    pipeline = Pipeline(
+        [
+            ("DataFrameTextNumberWords", DataFrameTextNumberWords("text", "number_words")),
+            ("DataFrameQueryFilter", DataFrameQueryFilter("number_words", query=">3")),
+        ]
+    )
+    expected = pipeline.fit_transform(df.copy())
+    for options in [{"task_size": 3}, {"task_size": 7, "balance_column": "text"}, {"balance_column": "text"}]:
+        transform = PipelineTransform(pipeline, njobs=2, shared_memory=shared_memory, **options)
+        output = transform.transform(df, 20)
+        assert output.equals(expected)
+
+
+@pytest.mark.parametrize("options", [{}, {"task_size": 3}, {"shared_memory": True}])
+def test_profile(options, tmp_path):
+    df = pd.DataFrame({"text": [f"{'word ' * (i % 7)}text {i}" for i in range(50)]})
+    pipeline = Pipeline(
+        [
+            ("DataFrameTextNumberWords", DataFrameTextNumberWords("text", "number_words")),
+            ("DataFrameQueryFilter", DataFrameQueryFilter("number_words", query=">3")),
+            ("DataFrameTextLength", DataFrameTextLength("text", "text_length")),
+        ]
+    )
+    expected = pipeline.fit_transform(df.copy())
+    with PipelineTransform(pipeline, njobs=2, profile=True, **options) as transform:
+        for _ in range(2):
+            output = transform.transform(df, 10)
+            assert output.equals(expected)
+            stats = transform.profiler.to_frame()
+            assert stats.index.tolist() == ["DataFrameTextNumberWords", "DataFrameQueryFilter", "DataFrameTextLength"]
+            assert stats["rows_in"].tolist() == [50, 50, len(expected)]
+            assert stats["rows_out"].tolist() == [50, len(expected), len(expected)]
+            assert stats["calls"].min() >= 5
+            assert (stats["wall_time"] > 0).all()
+            assert stats.loc["DataFrameTextNumberWords", "memory_delta"] > 0
+    records = json.loads(transform.profiler.to_json(str(tmp_path / "profile.json")))
+    assert [record["step"] for record in records] == stats.index.tolist()
+    assert records[2]["rows_in"] == len(expected)
+    assert "DataFrameQueryFilter" in transform.profiler.to_table()
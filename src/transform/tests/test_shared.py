@@ -0,0 +1,35 @@
+import pytest
+
+from src.fixtures.data import FIXTURE_DF
+from src.transform.shared import *
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    return FIXTURE_DF
+
+
+def test_to_shared_from_shared(dataset):
+    dataset = dataset.assign(type=dataset["type"].astype("category"), empty=None).set_index(pd.Index([7, 8, 9]))
+    name, size = to_shared(dataset)
+    try:
+        part = from_shared(name, size, dataset.index[1:], offset=1)
+        assert part.equals(dataset.iloc[1:])
+    finally:
+        output = from_shared(name, size, dataset.index, release=True)
+    assert output.equals(dataset)
+
+
+def test_to_shared_unsupported(dataset):
+    assert to_shared(dataset.assign(words=dataset["text"].str.split())) is None
+    assert to_shared(dataset.rename(columns={"text": 0})) is None
+
+
+def test_to_shared_keeps_dtypes(dataset):
+    dataset = dataset.assign(text=dataset["text"].where(dataset["id"] != 2), empty=None)
+    name, size = to_shared(dataset)
+    output = from_shared(name, size, dataset.index, release=True)
+    assert output.equals(dataset)
+    assert output["text"].isna().tolist() == [False, True, False] and output.loc[1, "text"] is not None
+    assert to_shared(dataset.assign(id=dataset["id"].astype(object))) is None
+    assert to_shared(dataset.assign(empty=pd.Series(["a", None, float("nan")], dtype=object))) is None
@@ -0,0 +1,186 @@
+import json
+import time
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from sklearn.pipeline import Pipeline
+
+
+STATS = ("calls", "rows_in", "rows_out", "wall_time", "cpu_time", "memory_delta")
+
+
+def frame_rows(df: Any) -> int:
+    return len(df) if isinstance(df, (pd.DataFrame, pd.Series)) else 0
+
+
+def frame_memory(df: Any) -> int:
+    """
+    > The memory held by a dataframe, strings and other objects included
+
+    :param df: The output of a step, anything else than a dataframe or a series weighs 0
+    :type df: Any
+    :return: The number of bytes
+    """
+    if isinstance(df, pd.DataFrame):
+        return int(df.memory_usage(index=True, deep=True).sum())
+    if isinstance(df, pd.Series):
+        return int(df.memory_usage(index=True, deep=True))
+
+    return 0
+
+
+class PipelineProfiler:
+    """It records the wall time, CPU time, rows and memory of every pipeline step, summed over the chunks."""
+
+    def __init__(self, memory: bool = True) -> None:
+        """
+        > The stats are kept per step name, in the order the steps first ran. The stats of several
+        processes are summed with `merge`
+
+        :param memory: measure the memory of the dataframe before and after every step. It walks every
+        string of the dataframe, so it can cost as much as a cheap step, defaults to True
+        :type memory: bool (optional)
+        """
+        self.memory = memory
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def reset(self) -> None:
+        self.stats = {}
+
+    def record(self, name: str, **stats: float) -> None:
+        """
+        > Add stats to the ones of the step
+
+        :param name: The name of the step
+        :type name: str
+        :param stats: The values to add, among calls, rows_in, rows_out, wall_time, cpu_time and
+        memory_delta
+        :type stats: float
+        """
+        step_stats = self.stats.setdefault(name, dict.fromkeys(STATS, 0))
+        for stat, value in stats.items():
+            step_stats[stat] += value
+
+    def run_step(self, name: str, step: Any, df: Any, fit: bool = True) -> Any:
+        """
+        > Fit and transform the dataframe with the step, and record what it cost. The memory delta is
+        measured before the step runs, since most operators modify their input in place
+
+        :param name: The name of the step
+        :type name: str
+        :param step: The pipeline step
+        :type step: Any
+        :param df: The input of the step
+        :type df: Any
+        :param fit: fit the step before transforming, defaults to True
+        :type fit: bool (optional)
+        :return: The output of the step
+        """
+        rows_in = frame_rows(df)
+        memory_in = frame_memory(df) if self.memory else 0
+        wall, cpu = time.perf_counter(), time.process_time()
+        if fit:
+            step.fit(df)
+        df = step.transform(df)
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        memory_delta = frame_memory(df) - memory_in if self.memory else 0
+        self.record(
+            name,
+            calls=1,
+            rows_in=rows_in,
+            rows_out=frame_rows(df),
+            wall_time=wall,
+            cpu_time=cpu,
+            memory_delta=memory_delta,
+        )
+
+        return df
+
+    def process(self, pipeline: Pipeline, df: Any, fit: bool = True) -> Any:
+        """
+        > Run the pipeline step by step, like `fit_transform` or `transform`, and record every step
+
+        :param pipeline: The pipeline
+        :type pipeline: Pipeline
+        :param df: The input dataframe
+        :type df: Any
+        :param fit: fit each step before transforming, like `fit_transform`, defaults to True
+        :type fit: bool (optional)
+        :return: The output of the pipeline
+        """
+        for name, step in pipeline.steps:
+            if step is None or step == "passthrough":
+                continue
+            df = self.run_step(name, step, df, fit)
+
+        return df
+
+    def pop(self) -> Dict[str, Dict[str, float]]:
+        """
+        > Take the stats recorded so far and start again from zero, so a worker sends every stat once
+
+        :return: The stats per step
+        """
+        stats, self.stats = self.stats, {}
+
+        return stats
+
+    def merge(self, stats: Dict[str, Dict[str, float]]) -> None:
+        """
+        > Add the stats recorded by another profiler, e.g. in a worker process
+
+        :param stats: The stats per step
+        :type stats: Dict[str, Dict[str, float]]
+        """
+        for name, step_stats in stats.items():
+            self.record(name, **step_stats)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        > The stats as a dataframe with one row per step, with the share of the total wall time spent in
+        every step and the rows processed per second
+
+        :return: A dataframe indexed by step name
+        """
+        df = pd.DataFrame.from_dict(self.stats, orient="index", columns=list(STATS))
+        df.index.name = "step"
+        total_wall = df["wall_time"].sum()
+        df["wall_share"] = df["wall_time"] / total_wall if total_wall > 0 else 0.0
+        df["rows_per_second"] = (df["rows_in"] / df["wall_time"]).where(df["wall_time"] > 0, 0.0)
+
+        return df
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        """
+        > Export the stats as JSON, a list of steps in the order they ran
+
+        :param path: The file to write the JSON to, if None it is only returned
+        :type path: str (optional)
+        :return: The JSON string
+        """
+        records = [{"step": name, **step_stats} for name, step_stats in self.stats.items()]
+        output = json.dumps(records, indent=1)
+        if path is not None:
+            with open(path, "w") as f:
+                f.write(output)
+
+        return output
+
+    def to_table(self) -> str:
+        """
+        > Format the stats as a text table, with the times in seconds and the memory in MB
+
+        :return: The table
+        """
+        df = self.to_frame()
+        df["memory_delta"] = df["memory_delta"] / 1024**2
+        formats = {
+            "wall_time": "{:.3f}".format,
+            "cpu_time": "{:.3f}".format,
+            "memory_delta_mb": "{:+.1f}".format,
+            "wall_share": "{:.0%}".format,
+            "rows_per_second": "{:,.0f}".format,
+        }
+
+        return df.rename(columns={"memory_delta": "memory_delta_mb"}).to_string(formatters=formats)